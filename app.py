@@ -1,19 +1,45 @@
 import os
 import re
-import tempfile
 import subprocess
-from datetime import datetime, UTC
+import threading
+import time
+import queue
+import json
+import hashlib
+import math
+import sqlite3
+import multiprocessing
+import atexit
+import bisect
+import logging
+import contextvars
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import base64
+import html
+import csv
+import io
+import zlib
+import struct
+from datetime import datetime, timedelta, UTC
 
 # --- Core Flask and Authentication Imports ---
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, Response, g, render_template, request, jsonify, redirect, url_for, flash, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user, login_required
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # --- AI/NLP Imports ---
+# transformers is imported lazily by the model loader so that admin and DB-only
+# scripts can import this module without paying the model startup cost.
 from textblob import TextBlob
-from transformers import pipeline
 import speech_recognition as sr
 
 # --- App and Database Setup ---
@@ -22,13 +48,318 @@ app = Flask(__name__, template_folder='.')
 
 # Flask Configuration
 app.config['SECRET_KEY'] = 'your_super_secret_and_complex_key' 
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///mindcheck.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///mindcheck.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Admission control for /analyze: at most *_CONCURRENCY check-ins of each kind
+# run at once, up to *_QUEUE_SIZE more wait ADMISSION_WAIT_SECONDS for a slot,
+# and the rest get a 503 with Retry-After. Each user is also limited to
+# RATE_LIMIT_CHECKINS_PER_MINUTE check-ins (bursts of RATE_LIMIT_BURST); 0 disables.
+app.config['ADMISSION_TEXT_CONCURRENCY'] = 8
+app.config['ADMISSION_TEXT_QUEUE_SIZE'] = 16
+app.config['ADMISSION_AUDIO_CONCURRENCY'] = 2
+app.config['ADMISSION_AUDIO_QUEUE_SIZE'] = 4
+app.config['ADMISSION_WAIT_SECONDS'] = 2
+app.config['ADMISSION_RETRY_AFTER_SECONDS'] = 5
+app.config['RATE_LIMIT_CHECKINS_PER_MINUTE'] = int(os.environ.get('RATE_LIMIT_CHECKINS_PER_MINUTE', 12))
+app.config['RATE_LIMIT_BURST'] = 5
+
+# Admin export (/api/admin_export): rows are streamed from the DB in chunks of
+# this size. Journal text is left out unless explicitly enabled.
+app.config['ADMIN_EXPORT_CHUNK_SIZE'] = 1000
+app.config['ADMIN_EXPORT_INCLUDE_TEXT'] = False
+
+# Largest batch accepted by /api/analyze_batch (texts or stored entries per call)
+app.config['ANALYZE_BATCH_MAX_SIZE'] = 256
+
+# Keep a per-user stats table updated on every check-in and serve the admin
+# dashboard from it. Run rebuild_stats.py once after enabling on an existing DB.
+app.config['USER_STATS_ENABLED'] = False
+
+# Emotion model micro-batching: concurrent requests are grouped into one pipeline call
+app.config['EMOTION_BATCHING'] = True
+app.config['EMOTION_BATCH_MAX_SIZE'] = 16
+app.config['EMOTION_BATCH_WINDOW_MS'] = 5
+
+# Emotion model loading: the model is loaded in the background on first use
+app.config['EMOTION_MODEL_NAME'] = 'j-hartmann/emotion-english-distilroberta-base'
+app.config['EMOTION_MODEL_WAIT_SECONDS'] = 120
+
+# Long entries are scored over overlapping token windows (capped for latency)
+# instead of being truncated
+app.config['EMOTION_WINDOW_TOKENS'] = 510
+app.config['EMOTION_WINDOW_OVERLAP'] = 64
+app.config['EMOTION_MAX_WINDOWS'] = 8
+
+# Emotion inference backend: 'transformers' (default PyTorch pipeline),
+# 'quantized' (dynamic int8 PyTorch), 'onnx' (ONNX Runtime via optimum) or
+# 'stub' (deterministic scores, for offline benchmarking)
+app.config['EMOTION_BACKEND'] = os.environ.get('EMOTION_BACKEND', 'transformers')
+app.config['EMOTION_ONNX_DIR'] = 'models/emotion-onnx'
+app.config['EMOTION_STUB_DELAY_MS'] = 0
+
+# Emotion/sentiment result cache, keyed by a hash of the normalized text.
+# Set RESULT_CACHE_DB to a SQLite file path to share results between workers.
+app.config['RESULT_CACHE_SIZE'] = 4096
+app.config['RESULT_CACHE_TTL_SECONDS'] = 7 * 24 * 3600
+app.config['RESULT_CACHE_DB'] = None
+
+# Process-pool analysis: with ANALYSIS_WORKERS > 0, model inference and text
+# scoring run in that many worker processes instead of the request thread.
+app.config['ANALYSIS_WORKERS'] = int(os.environ.get('ANALYSIS_WORKERS', 0))
+app.config['ANALYSIS_QUEUE_SIZE'] = 64
+app.config['ANALYSIS_TASK_TIMEOUT_SECONDS'] = 60
+app.config['ANALYSIS_HEALTH_INTERVAL_SECONDS'] = 10
+app.config['ANALYSIS_START_TIMEOUT_SECONDS'] = 300
+
+# Voice check-ins: uploads are decoded in memory by ffmpeg, within these limits
+app.config['AUDIO_MAX_BYTES'] = 10 * 1024 * 1024
+app.config['AUDIO_MAX_SECONDS'] = 180
+app.config['FFMPEG_TIMEOUT_SECONDS'] = 30
+
+# Speech-to-text backend: 'google' (Web Speech API), 'vosk' or 'whisper'
+# (offline local models), or 'stub' (deterministic, for offline benchmarking)
+app.config['ASR_BACKEND'] = os.environ.get('ASR_BACKEND', 'google')
+app.config['ASR_TIMEOUT_SECONDS'] = 15
+app.config['ASR_VOSK_MODEL_PATH'] = 'models/vosk-model-small-en-us-0.15'
+app.config['ASR_WHISPER_MODEL'] = 'base.en'
+app.config['ASR_STUB_TEXT'] = 'I have been feeling a little stressed about work but mostly okay.'
+app.config['ASR_STUB_DELAY_MS'] = 0
+
+# Session user cache: logged-in users are loaded from memory instead of the DB.
+# Commits that change a User invalidate it, including from other processes
+# (e.g. make_admin.py) via a marker file in the instance folder.
+app.config['USER_CACHE_SIZE'] = 10000
+app.config['USER_CACHE_TTL_SECONDS'] = 300
+
+# Async audio jobs: clients that send async=1 get a job id and poll/subscribe for the result.
+# Jobs run at most ADMISSION_AUDIO_CONCURRENCY at a time, shared with synchronous voice check-ins.
+app.config['AUDIO_JOB_WORKERS'] = 4
+app.config['AUDIO_JOB_TTL_SECONDS'] = 600
+app.config['AUDIO_JOB_MAX_PENDING'] = 32
+
+# Write-behind check-ins: new entries are queued and committed in small batches
+# by a single writer thread, with SQLite in WAL mode. Responses return once the
+# entry is queued, or once it is committed if WRITE_BEHIND_WAIT is set or the
+# request sends durable=1.
+app.config['WRITE_BEHIND_ENABLED'] = os.environ.get('WRITE_BEHIND_ENABLED') == '1'
+app.config['WRITE_BEHIND_QUEUE_SIZE'] = 1024
+app.config['WRITE_BEHIND_BATCH_SIZE'] = 64
+app.config['WRITE_BEHIND_WINDOW_MS'] = 10
+app.config['WRITE_BEHIND_WAIT'] = False
+app.config['WRITE_BEHIND_WAIT_SECONDS'] = 10
+
+# Observability: Prometheus-text metrics at /metrics (send `Authorization: Bearer
+# <METRICS_TOKEN>` when a token is set), structured logs (LOG_FORMAT 'json' or
+# 'text'), and a warning with a per-stage breakdown for any request slower than
+# SLOW_REQUEST_MS (None disables it)
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+app.config['LOG_FORMAT'] = os.environ.get('LOG_FORMAT', 'json')
+app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO')
+app.config['SLOW_REQUEST_MS'] = 2000
+
 # Initialize Extensions
 db = SQLAlchemy(app)
 CORS(app)
 
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the writer; synchronous=NORMAL is crash-safe under WAL."""
+    if not app.config['WRITE_BEHIND_ENABLED'] or not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA busy_timeout=5000')
+    cursor.close()
+
+# --- Logging and Metrics ---
+
+class StructuredFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, or as text with key=value pairs.
+
+    Anything passed via `extra=` is emitted as its own field.
+    """
+
+    RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+    def __init__(self, as_json=True):
+        super().__init__()
+        self.as_json = as_json
+
+    def format(self, record):
+        fields = {key: value for key, value in vars(record).items() if key not in self.RESERVED}
+        if record.exc_info:
+            fields['exc'] = self.formatException(record.exc_info)
+        ts = datetime.fromtimestamp(record.created, UTC).isoformat(timespec='milliseconds')
+        if self.as_json:
+            return json.dumps(
+                {'ts': ts, 'level': record.levelname, 'logger': record.name, 'msg': record.getMessage(), **fields},
+                default=str,
+            )
+        extras = ''.join(f' {key}={value}' for key, value in fields.items())
+        return f'{ts} {record.levelname} {record.name}: {record.getMessage()}{extras}'
+
+
+def configure_logging():
+    handler = logging.StreamHandler()
+    handler.setFormatter(StructuredFormatter(as_json=app.config['LOG_FORMAT'] == 'json'))
+    log.handlers[:] = [handler]
+    log.setLevel(app.config['LOG_LEVEL'])
+    log.propagate = False
+
+
+log = logging.getLogger('mindcheck')
+configure_logging()
+
+# Stage timings of the current request (or analysis worker task), for the slow-request log
+stage_timings = contextvars.ContextVar('stage_timings', default=None)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Process-local counters, gauges and histograms in Prometheus text format.
+
+    Series are keyed by metric name and a sorted tuple of label pairs.
+    Collectors registered with `add_collector` are called at scrape time and
+    yield (name, labels, value) gauges for state owned elsewhere.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._collectors = []
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((labels or {}).items()))
+
+    def inc(self, name, labels=None, amount=1):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def gauge_add(self, name, amount, labels=None):
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + amount
+
+    def observe(self, name, value, labels=None):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_stage(self, stage, seconds):
+        self.observe('mindcheck_stage_duration_seconds', seconds, {'stage': stage})
+        timings = stage_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started)
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    @staticmethod
+    def _series(name, labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return name
+        rendered = ','.join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"')) for key, value in pairs)
+        return f'{name}{{{rendered}}}'
+
+    def render(self):
+        collected = {}
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                collected[self._key(name, labels)] = value
+
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = {**self._gauges, **collected}
+            histograms = {key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()}
+
+        lines = []
+        for kind, series in (('counter', counters), ('gauge', gauges)):
+            declared = set()
+            for (name, labels), value in sorted(series.items()):
+                if name not in declared:
+                    declared.add(name)
+                    lines.append(f'# TYPE {name} {kind}')
+                lines.append(f'{self._series(name, labels)} {value}')
+        declared = set()
+        for (name, labels), (counts, total, count) in sorted(histograms.items()):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f'# TYPE {name} histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append(f'{self._series(name + "_bucket", labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{self._series(name + "_sum", labels)} {total}')
+            lines.append(f'{self._series(name + "_count", labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    g.metrics_endpoint = request.endpoint or 'unmatched'
+    stage_timings.set({})
+    metrics.gauge_add('mindcheck_http_requests_in_flight', 1, {'endpoint': g.metrics_endpoint})
+
+
+@app.after_request
+def finish_request_metrics(response):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    endpoint = g.metrics_endpoint
+    metrics.gauge_add('mindcheck_http_requests_in_flight', -1, {'endpoint': endpoint})
+    metrics.inc('mindcheck_http_requests_total', {'endpoint': endpoint, 'method': request.method, 'status': response.status_code})
+    metrics.observe('mindcheck_http_request_duration_seconds', elapsed, {'endpoint': endpoint})
+
+    slow_ms = app.config['SLOW_REQUEST_MS']
+    if slow_ms is not None and elapsed * 1000 >= slow_ms:
+        log.warning('slow request', extra={
+            'endpoint': endpoint,
+            'method': request.method,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 1),
+            'stages_ms': {stage: round(seconds * 1000, 1) for stage, seconds in (stage_timings.get() or {}).items()},
+        })
+    return response
+
 # --- Flask-Login Setup ---
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -56,6 +387,20 @@ class User(db.Model, UserMixin):
     def __repr__(self):
         return f'<User {self.username}>'
 
+# Fixed label order for stored emotion vectors (the emotion model's labels)
+EMOTION_LABELS = ('anger', 'disgust', 'fear', 'joy', 'neutral', 'sadness', 'surprise')
+_EMOTION_STRUCT = struct.Struct(f'<{len(EMOTION_LABELS)}f')
+KEYWORD_OVERRIDE_TAG = 'keyword-override'
+
+
+def pack_emotions(all_emotions):
+    return _EMOTION_STRUCT.pack(*(all_emotions.get(label, 0.0) for label in EMOTION_LABELS))
+
+
+def unpack_emotions(blob):
+    return {label: round(score, 1) for label, score in zip(EMOTION_LABELS, _EMOTION_STRUCT.unpack(blob))}
+
+
 class CheckInEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(UTC))
@@ -64,22 +409,392 @@ class CheckInEntry(db.Model):
     full_text = db.Column(db.Text, nullable=False)
     recommendations = db.Column(db.Text, nullable=True) 
     
+    # Full emotion distribution as packed float32s in EMOTION_LABELS order,
+    # plus the model@backend (or override rule) that produced it
+    emotion_vector = db.Column(db.LargeBinary, nullable=True)
+    dominant_emotion = db.Column(db.String(20), nullable=True)
+    emotion_model = db.Column(db.String(120), nullable=True)
+
+    # Bumped whenever a saved entry is rewritten in place (re-scoring), so
+    # history ETags change even when counts and score sums do not
+    version = db.Column(db.Integer, nullable=True, default=0)
+    
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
-    def to_dict(self):
+    # History is always read per user, newest first (keyset pagination)
+    __table_args__ = (db.Index('ix_check_in_entry_user_timestamp', 'user_id', 'timestamp'),)
+
+    SERIALIZERS = {
+        'id': lambda e: e.id,
+        'timestamp': lambda e: e.timestamp.isoformat(),
+        'mood_score': lambda e: e.mood_score,
+        'stress_score': lambda e: e.stress_score,
+        'full_text': lambda e: e.full_text,
+        'recommendations': lambda e: e.recommendations.split('||') if e.recommendations else [],
+        'emotions': lambda e: e.emotion_breakdown(),
+    }
+
+    def set_emotions(self, emotions):
+        self.emotion_vector = pack_emotions(emotions['all_emotions'])
+        self.dominant_emotion = emotions['dominant']
+        self.emotion_model = emotions.get('model')
+
+    def emotion_breakdown(self):
+        """The stored emotion distribution, or None for entries saved before it was kept."""
+        if self.emotion_vector is None:
+            return None
         return {
-            'id': self.id,
-            'timestamp': self.timestamp.isoformat(),
-            'mood_score': self.mood_score,
-            'stress_score': self.stress_score,
-            'full_text': self.full_text,
-            'recommendations': self.recommendations.split('||') if self.recommendations else []
+            'dominant': self.dominant_emotion,
+            'all_emotions': unpack_emotions(self.emotion_vector),
+            'model': self.emotion_model,
         }
 
+    def to_dict(self, fields=None):
+        return {field: self.SERIALIZERS[field](self) for field in (fields or self.SERIALIZERS)}
+
+class UserStats(db.Model):
+    """Running per-user totals, maintained on each check-in when USER_STATS_ENABLED."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    checkin_count = db.Column(db.Integer, nullable=False, default=0)
+    mood_sum = db.Column(db.Integer, nullable=False, default=0)
+    stress_sum = db.Column(db.Integer, nullable=False, default=0)
+    last_activity = db.Column(db.DateTime, nullable=True)
+
+
+PLATFORM_SCOPE = 0  # DailyRollup.user_id used for platform-wide rows
+
+
+class DailyRollup(db.Model):
+    """Mood/stress totals per user per day; user_id PLATFORM_SCOPE holds platform-wide rows."""
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    day = db.Column(db.Date, primary_key=True)
+    checkin_count = db.Column(db.Integer, nullable=False, default=0)
+    mood_sum = db.Column(db.Integer, nullable=False, default=0)
+    mood_min = db.Column(db.Integer, nullable=False)
+    mood_max = db.Column(db.Integer, nullable=False)
+    stress_sum = db.Column(db.Integer, nullable=False, default=0)
+    stress_min = db.Column(db.Integer, nullable=False)
+    stress_max = db.Column(db.Integer, nullable=False)
+
+
+def record_daily_rollups(entry):
+    """Folds a new entry into its user's and the platform's rollup for that day."""
+    for scope in (entry.user_id, PLATFORM_SCOPE):
+        stmt = sqlite_insert(DailyRollup).values(
+            user_id=scope,
+            day=entry.timestamp.date(),
+            checkin_count=1,
+            mood_sum=entry.mood_score,
+            mood_min=entry.mood_score,
+            mood_max=entry.mood_score,
+            stress_sum=entry.stress_score,
+            stress_min=entry.stress_score,
+            stress_max=entry.stress_score,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyRollup.user_id, DailyRollup.day],
+            set_={
+                'checkin_count': DailyRollup.checkin_count + 1,
+                'mood_sum': DailyRollup.mood_sum + stmt.excluded.mood_sum,
+                'mood_min': db.func.min(DailyRollup.mood_min, stmt.excluded.mood_min),
+                'mood_max': db.func.max(DailyRollup.mood_max, stmt.excluded.mood_max),
+                'stress_sum': DailyRollup.stress_sum + stmt.excluded.stress_sum,
+                'stress_min': db.func.min(DailyRollup.stress_min, stmt.excluded.stress_min),
+                'stress_max': db.func.max(DailyRollup.stress_max, stmt.excluded.stress_max),
+            },
+        )
+        db.session.execute(stmt)
+
+
+def rebuild_daily_rollups():
+    """Recomputes every DailyRollup row from CheckInEntry."""
+    db.session.execute(db.delete(DailyRollup))
+    day = db.func.date(CheckInEntry.timestamp)
+    columns = ['user_id', 'day', 'checkin_count', 'mood_sum', 'mood_min', 'mood_max', 'stress_sum', 'stress_min', 'stress_max']
+    aggregates = [
+        db.func.count(CheckInEntry.id),
+        db.func.sum(CheckInEntry.mood_score), db.func.min(CheckInEntry.mood_score), db.func.max(CheckInEntry.mood_score),
+        db.func.sum(CheckInEntry.stress_score), db.func.min(CheckInEntry.stress_score), db.func.max(CheckInEntry.stress_score),
+    ]
+    db.session.execute(db.insert(DailyRollup).from_select(
+        columns, db.select(CheckInEntry.user_id, day, *aggregates).group_by(CheckInEntry.user_id, day)
+    ))
+    db.session.execute(db.insert(DailyRollup).from_select(
+        columns, db.select(db.literal(PLATFORM_SCOPE), day, *aggregates).group_by(day)
+    ))
+    db.session.commit()
+
+
+def upgrade_schema():
+    """Brings an existing database up to the models after create_all().
+
+    create_all() only creates missing tables, so this adds nullable columns
+    and indexes that were introduced on tables that already exist.
+    """
+    inspector = db.inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    ensure_daily_rollups()
+    ensure_search_index()
+
+
+def ensure_daily_rollups():
+    """Backfills DailyRollup once for a database whose check-ins predate the rollups."""
+    has_rollups = db.session.execute(db.select(DailyRollup.day).limit(1)).first()
+    has_entries = db.session.execute(db.select(CheckInEntry.id).limit(1)).first()
+    if has_entries and not has_rollups:
+        rebuild_daily_rollups()
+    else:
+        db.session.rollback()
+
+
+# --- Full-Text Search Index ---
+
+SEARCH_TABLE = 'check_in_entry_fts'
+
+SEARCH_TRIGGERS = ('insert', 'delete', 'update')
+
+# External-content FTS5 table over CheckInEntry.full_text. user_id is indexed
+# too, so a search's MATCH only visits that user's entries. The triggers keep
+# it in sync on every write path (check-ins, the write-behind queue, bulk loads).
+SEARCH_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"full_text, user_id, content='check_in_entry', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert AFTER INSERT ON check_in_entry BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, full_text, user_id) VALUES (new.id, new.full_text, new.user_id); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete AFTER DELETE ON check_in_entry BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, full_text, user_id) "
+    f"VALUES ('delete', old.id, old.full_text, old.user_id); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update AFTER UPDATE OF full_text, user_id ON check_in_entry BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, full_text, user_id) "
+    f"VALUES ('delete', old.id, old.full_text, old.user_id); "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, full_text, user_id) VALUES (new.id, new.full_text, new.user_id); END",
+)
+
+
+def ensure_search_index():
+    """Creates the search index and its triggers if missing, indexing existing entries once.
+
+    An index from before user_id was indexed is dropped and rebuilt.
+    """
+    try:
+        with db.engine.begin() as conn:
+            existing = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+            ).first()
+            exists = existing is not None and 'user_id' in existing.sql
+            if existing is not None and not exists:
+                for trigger in SEARCH_TRIGGERS:
+                    conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{trigger}")
+                conn.exec_driver_sql(f"DROP TABLE {SEARCH_TABLE}")
+            for statement in SEARCH_INDEX_DDL:
+                conn.exec_driver_sql(statement)
+            if not exists:
+                conn.exec_driver_sql(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+    except OperationalError as e:
+        log.warning('full-text search unavailable', extra={'error': str(e)})
+
+
+def rebuild_search_index():
+    """Re-indexes every entry's text from CheckInEntry."""
+    db.session.execute(db.text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+    db.session.commit()
+
+
+def record_user_stats(entry):
+    """Adds a new entry to its user's running totals (in the caller's transaction)."""
+    stmt = sqlite_insert(UserStats).values(
+        user_id=entry.user_id,
+        checkin_count=1,
+        mood_sum=entry.mood_score,
+        stress_sum=entry.stress_score,
+        last_activity=entry.timestamp,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserStats.user_id],
+        set_={
+            'checkin_count': UserStats.checkin_count + 1,
+            'mood_sum': UserStats.mood_sum + stmt.excluded.mood_sum,
+            'stress_sum': UserStats.stress_sum + stmt.excluded.stress_sum,
+            'last_activity': db.func.max(db.func.coalesce(UserStats.last_activity, stmt.excluded.last_activity), stmt.excluded.last_activity),
+        },
+    )
+    db.session.execute(stmt)
+
+
+def rebuild_user_stats():
+    """Recomputes the UserStats table from CheckInEntry in one grouped query."""
+    db.session.execute(db.delete(UserStats))
+    db.session.execute(db.insert(UserStats).from_select(
+        ['user_id', 'checkin_count', 'mood_sum', 'stress_sum', 'last_activity'],
+        db.select(
+            CheckInEntry.user_id,
+            db.func.count(CheckInEntry.id),
+            db.func.sum(CheckInEntry.mood_score),
+            db.func.sum(CheckInEntry.stress_score),
+            db.func.max(CheckInEntry.timestamp),
+        ).group_by(CheckInEntry.user_id)
+    ))
+    db.session.commit()
+
+
+def user_aggregates_query():
+    """Every user with check-in count, score sums and last activity, in one query.
+
+    Reads the incremental UserStats table when USER_STATS_ENABLED, otherwise
+    aggregates CheckInEntry with a single GROUP BY.
+    """
+    if app.config['USER_STATS_ENABLED']:
+        stats = UserStats.__table__
+    else:
+        stats = db.select(
+            CheckInEntry.user_id.label('user_id'),
+            db.func.count(CheckInEntry.id).label('checkin_count'),
+            db.func.sum(CheckInEntry.mood_score).label('mood_sum'),
+            db.func.sum(CheckInEntry.stress_score).label('stress_sum'),
+            db.func.max(CheckInEntry.timestamp).label('last_activity'),
+        ).group_by(CheckInEntry.user_id).subquery()
+
+    return (
+        db.select(
+            User.username, User.email, User.role,
+            stats.c.checkin_count, stats.c.mood_sum, stats.c.stress_sum, stats.c.last_activity,
+        )
+        .outerjoin(stats, stats.c.user_id == User.id)
+        .order_by(User.id)
+    )
+
 # --- Flask-Login User Loader ---
+
+class SessionUser(UserMixin):
+    """The id, username and role of a logged-in user, as cached for session loading."""
+
+    def __init__(self, id, username, role):
+        self.id = id
+        self.username = username
+        self.role = role
+
+    def __repr__(self):
+        return f'<SessionUser {self.username}>'
+
+
+class UserCache:
+    """Bounded LRU cache with TTL of SessionUsers, keyed by user id.
+
+    `invalidate` drops an entry here and touches `marker_path`; every process
+    compares the marker's mtime on lookup and clears its cache when it moves,
+    so invalidations from other processes apply without a DB round trip.
+    """
+
+    def __init__(self, max_size=10000, ttl_seconds=300, marker_path=None):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.marker_path = marker_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._marker_mtime = self._read_marker()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _read_marker(self):
+        try:
+            return os.stat(self.marker_path).st_mtime_ns if self.marker_path else None
+        except FileNotFoundError:
+            return None
+
+    def get(self, user_id):
+        marker_mtime = self._read_marker()
+        now = time.time()
+        with self._lock:
+            if marker_mtime != self._marker_mtime:
+                self._marker_mtime = marker_mtime
+                self._entries.clear()
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+
+    def set(self, user):
+        with self._lock:
+            self._entries[user.id] = (user, time.time() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id=None):
+        """Drops one user (or everyone) here and signals other processes to drop their copies."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+            self.invalidations += 1
+        if self.marker_path:
+            os.makedirs(os.path.dirname(self.marker_path), exist_ok=True)
+            with open(self.marker_path, 'w') as marker:
+                marker.write(str(time.time_ns()))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxSize': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+
+user_cache = UserCache(
+    max_size=app.config['USER_CACHE_SIZE'],
+    ttl_seconds=app.config['USER_CACHE_TTL_SECONDS'],
+    marker_path=os.path.join(app.instance_path, 'user_cache.invalidated'),
+)
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_changed_users(session, flush_context):
+    changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if changed:
+        session.info.setdefault('changed_user_ids', set()).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_changed_users(session):
+    for user_id in session.info.pop('changed_user_ids', ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def forget_changed_users(session):
+    session.info.pop('changed_user_ids', None)
+
+
 @login_manager.user_loader
 def load_user(user_id):
-    return db.session.get(User, int(user_id))
+    user_id = int(user_id)
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    cached = SessionUser(user.id, user.username, user.role)
+    user_cache.set(cached)
+    return cached
 
 # --- Handle Unauthorized API Requests ---
 @login_manager.unauthorized_handler
@@ -90,17 +805,366 @@ def unauthorized():
 
 
 # --- AI Model Initialization ---
-print("Loading emotion classification model...")
-try:
-    emotion_classifier = pipeline(
+
+def load_transformers_backend(model_name):
+    from transformers import pipeline
+    return pipeline(
         'text-classification',
-        model='j-hartmann/emotion-english-distilroberta-base',
+        model=model_name,
         top_k=None 
     )
-    print("Emotion model loaded successfully.")
-except Exception as e:
-    print(f"Error loading AI model: {e}")
-    emotion_classifier = None 
+
+
+def load_quantized_backend(model_name):
+    """Same pipeline with the Linear layers dynamically quantized to int8 for CPU."""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return pipeline('text-classification', model=model, tokenizer=tokenizer, top_k=None)
+
+
+def load_onnx_backend(model_name):
+    """ONNX Runtime pipeline; the model is exported once into EMOTION_ONNX_DIR."""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer, pipeline
+    export_dir = app.config['EMOTION_ONNX_DIR']
+    if os.path.isdir(export_dir):
+        model = ORTModelForSequenceClassification.from_pretrained(export_dir)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+    return pipeline('text-classification', model=model, tokenizer=tokenizer, top_k=None)
+
+
+class StubEmotionClassifier:
+    """Deterministic stand-in for the emotion pipeline.
+
+    Label scores are derived from a hash of each text, and every call sleeps
+    EMOTION_STUB_DELAY_MS to stand in for inference time.
+    """
+
+    def __init__(self, delay_ms=0):
+        self.delay = delay_ms / 1000.0
+
+    @staticmethod
+    def scores(text):
+        digest = hashlib.sha256(text.encode('utf-8')).digest()
+        weights = [digest[i] + 1 for i in range(len(EMOTION_LABELS))]
+        total = sum(weights)
+        ranked = sorted(zip(EMOTION_LABELS, weights), key=lambda pair: -pair[1])
+        return [{'label': label, 'score': weight / total} for label, weight in ranked]
+
+    def __call__(self, texts, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        if isinstance(texts, str):
+            return [self.scores(texts)]
+        return [self.scores(text) for text in texts]
+
+
+def load_stub_backend(model_name):
+    return StubEmotionClassifier(app.config['EMOTION_STUB_DELAY_MS'])
+
+
+EMOTION_BACKENDS = {
+    'transformers': load_transformers_backend,
+    'quantized': load_quantized_backend,
+    'onnx': load_onnx_backend,
+    'stub': load_stub_backend,
+}
+
+
+def emotion_model_tag():
+    """Identifies the model and backend that produced an emotion result."""
+    return f"{app.config['EMOTION_MODEL_NAME']}@{app.config['EMOTION_BACKEND']}"
+
+
+def load_emotion_classifier():
+    backend = app.config['EMOTION_BACKEND']
+    if backend not in EMOTION_BACKENDS:
+        raise ValueError(f"Unknown emotion backend '{backend}'. Choose one of: {', '.join(EMOTION_BACKENDS)}")
+    return EMOTION_BACKENDS[backend](app.config['EMOTION_MODEL_NAME'])
+
+
+class LazyModel:
+    """Loads a model on a background thread the first time it is needed.
+
+    Importing the app never touches the model. `start_loading` kicks off the
+    load without blocking, and `get` waits (up to `timeout` seconds) for it to
+    finish, returning None if loading failed or is still in progress.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.state = 'not_loaded'
+        self.error = None
+        self.load_seconds = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def start_loading(self):
+        with self._lock:
+            if self.state != 'not_loaded':
+                return
+            self.state = 'loading'
+        threading.Thread(target=self._load, name=f'load-{self.name}', daemon=True).start()
+
+    def _load(self):
+        log.info('loading model', extra={'model': self.name})
+        started = time.perf_counter()
+        try:
+            self._model = self.loader()
+            self.state = 'ready'
+            log.info('model loaded', extra={'model': self.name, 'load_seconds': round(time.perf_counter() - started, 2)})
+        except Exception as e:
+            log.error('model failed to load', extra={'model': self.name, 'error': str(e)})
+            self.error = str(e)
+            self.state = 'failed'
+        finally:
+            self.load_seconds = round(time.perf_counter() - started, 2)
+            self._done.set()
+
+    def get(self, timeout=None):
+        self.start_loading()
+        self._done.wait(timeout)
+        return self._model
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    def status(self):
+        return {'state': self.state, 'error': self.error, 'loadSeconds': self.load_seconds}
+
+
+emotion_model = LazyModel('emotion', load_emotion_classifier)
+
+
+class EmotionBatcher:
+    """Groups texts from concurrent requests into batched classifier calls.
+
+    Callers block in `classify` while a single background thread collects
+    pending texts for up to `window_ms` (or until `max_batch_size` is reached),
+    runs them through `classify_batch` in one call and hands each caller back
+    its own result.
+    """
+
+    def __init__(self, classify_batch, max_batch_size=16, window_ms=5):
+        self.classify_batch = classify_batch
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000.0
+        self._queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._batches = 0
+        self._items = 0
+        self._max_seen = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def classify(self, text):
+        return self.classify_all([text])[0]
+
+    def classify_all(self, texts):
+        """Queues several texts (e.g. one entry's windows) and waits for all of them."""
+        self._ensure_started()
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future, time.perf_counter()))
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='emotion-batcher', daemon=True)
+                self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            waits = [started - enqueued for _, _, enqueued in batch]
+            try:
+                results = self.classify_batch([text for text, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._max_seen = max(self._max_seen, len(batch))
+                self._wait_total += sum(waits)
+                self._wait_max = max(self._wait_max, max(waits))
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'batches': self._batches,
+                'items': self._items,
+                'pending': self._queue.qsize(),
+                'avgBatchSize': round(self._items / self._batches, 2) if self._batches else 0,
+                'maxBatchSize': self._max_seen,
+                'avgQueueWaitMs': round(self._wait_total / self._items * 1000, 2) if self._items else 0,
+                'maxQueueWaitMs': round(self._wait_max * 1000, 2),
+            }
+
+
+emotion_batcher = EmotionBatcher(
+    lambda texts: emotion_model.get()(texts, batch_size=len(texts), truncation=True),
+    max_batch_size=app.config['EMOTION_BATCH_MAX_SIZE'],
+    window_ms=app.config['EMOTION_BATCH_WINDOW_MS'],
+)
+
+# --- Result Cache ---
+
+class ResultCache:
+    """Bounded LRU cache with TTL for model and sentiment results.
+
+    Keys are a SHA-256 of the whitespace-normalized text, namespaced by what
+    was computed (e.g. the model name), so identical check-ins reuse earlier
+    results. With `db_path` set, entries are also written to a SQLite table
+    that every worker process reads on a local miss; expired rows there are
+    pruned at most every `prune_interval` seconds. Values must be JSON
+    serializable.
+    """
+
+    def __init__(self, max_size=4096, ttl_seconds=None, db_path=None, prune_interval=300):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.db_path = db_path
+        self.prune_interval = prune_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._last_prune = 0.0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(namespace, text):
+        normalized = ' '.join(text.split())
+        return namespace + ':' + hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS result_cache '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS ix_result_cache_expires ON result_cache (expires)')
+        return self._db
+
+    def _remember(self, key, value, expires):
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, namespace, text):
+        key = self.make_key(namespace, text)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            if self.db_path:
+                row = self._connect().execute(
+                    'SELECT value, expires FROM result_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row and (row[1] is None or row[1] > now):
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, namespace, text, value):
+        key = self.make_key(namespace, text)
+        expires = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._remember(key, value, expires)
+            if self.db_path:
+                db = self._connect()
+                db.execute(
+                    'INSERT OR REPLACE INTO result_cache (key, value, expires) VALUES (?, ?, ?)',
+                    (key, json.dumps(value), expires)
+                )
+                now = time.time()
+                if now - self._last_prune >= self.prune_interval:
+                    db.execute('DELETE FROM result_cache WHERE expires IS NOT NULL AND expires <= ?', (now,))
+                    self._last_prune = now
+                db.commit()
+
+    def clear(self):
+        """Drops the in-memory entries (the shared SQLite table is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, namespace, text, compute):
+        value = self.get(namespace, text)
+        if value is None:
+            value = compute()
+            self.set(namespace, text, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxSize': self.max_size,
+                'hits': self.hits,
+                'diskHits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hitRate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0,
+            }
+
+
+result_cache = ResultCache(
+    max_size=app.config['RESULT_CACHE_SIZE'],
+    ttl_seconds=app.config['RESULT_CACHE_TTL_SECONDS'],
+    db_path=app.config['RESULT_CACHE_DB'],
+)
 
 # --- Keyword Definitions (Revised) ---
 DEPRESSION_KEYWORDS = {
@@ -120,38 +1184,150 @@ POSITIVE_KEYWORDS = [
     'manageable', 'but i', 'however', 'mostly'
 ]
 
+# Extra cue words checked by the emotion override and feeling mapping rules
+EMOTION_CUE_KEYWORDS = [
+    'too much', 'disappoint', 'project', 'threat', 'mad', 'optimistic', 'proud'
+]
+
+# --- Keyword Matching Engine ---
+
+class KeywordHits:
+    """The set of lexicon keywords found in one text, with per-category counts."""
+
+    def __init__(self, found, lexicons):
+        self.found = found
+        self.counts = {cat: sum(1 for k in words if k in found) for cat, words in lexicons.items()}
+
+    def __contains__(self, keyword):
+        return keyword in self.found
+
+    def count(self, *categories):
+        return sum(self.counts[cat] for cat in categories)
+
+    def any(self, *keywords):
+        return any(k in self.found for k in keywords)
+
+
+class KeywordMatcher:
+    """Finds every lexicon keyword in a text with a single compiled-regex pass.
+
+    Keywords are matched as plain substrings, exactly like `k in text_lower`.
+    The alternation is ordered longest-first so each start position reports the
+    longest keyword there; any shorter keyword contained in it is added back
+    from a precomputed table, which keeps overlapping hits such as 'panic' and
+    'panic attack' both counted.
+    """
+
+    def __init__(self, lexicons):
+        self.lexicons = {cat: tuple(words) for cat, words in lexicons.items()}
+        vocab = sorted({k for words in self.lexicons.values() for k in words}, key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in vocab) + '))')
+        self._contained = {k: frozenset(o for o in vocab if o in k) for k in vocab}
+
+    def scan(self, text_lower):
+        found = set()
+        for match in self._pattern.finditer(text_lower):
+            found |= self._contained[match.group(1)]
+        return KeywordHits(found, self.lexicons)
+
+
+keyword_matcher = KeywordMatcher({
+    'depression_high': DEPRESSION_KEYWORDS['high_risk'],
+    'depression_medium': DEPRESSION_KEYWORDS['medium_risk'],
+    'depression_low': DEPRESSION_KEYWORDS['low_risk'],
+    'stress_high': STRESS_KEYWORDS['high'],
+    'stress_medium': STRESS_KEYWORDS['medium'],
+    'stress_low': STRESS_KEYWORDS['low'],
+    'positive': POSITIVE_KEYWORDS,
+    'cues': EMOTION_CUE_KEYWORDS,
+})
+
+# --- Per-Request Analysis Context ---
+
+class AnalysisContext:
+    """Everything derived from one check-in's text, computed once and shared.
+
+    The analyzers read the normalized text, keyword hits, polarity and emotion
+    distribution from here instead of lowercasing, rescanning or re-running
+    TextBlob themselves. Results are filled in by `run_analysis`.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.text_lower = text.lower()
+        with metrics.timer('keywords'):
+            self.hits = keyword_matcher.scan(self.text_lower)
+        self._polarity = None
+        self.emotions = None
+        self.mood = None
+        self.stress = None
+        self.recommendations = None
+        self.feelings = None
+
+    @property
+    def polarity(self):
+        if self._polarity is None:
+            self._polarity = result_cache.get_or_compute(
+                'polarity', self.text, lambda: TextBlob(self.text).sentiment.polarity
+            )
+        return self._polarity
+
+    def results(self):
+        """Plain-dict form of the computed results, e.g. to cross a process boundary."""
+        return {
+            'polarity': self._polarity,
+            'emotions': self.emotions,
+            'mood': self.mood,
+            'stress': self.stress,
+            'recommendations': self.recommendations,
+            'feelings': self.feelings,
+        }
+
+    @classmethod
+    def from_results(cls, text, results):
+        ctx = cls(text)
+        ctx._polarity = results['polarity']
+        ctx.emotions = results['emotions']
+        ctx.mood = results['mood']
+        ctx.stress = results['stress']
+        ctx.recommendations = results['recommendations']
+        ctx.feelings = results['feelings']
+        return ctx
+
+
 # ----------------------------------------------------
 # --- AI Analysis Functions (FINAL REVISIONS) ---
 # ----------------------------------------------------
 
-def map_emotions_to_feelings(emotions, text_lower):
+def map_emotions_to_feelings(ctx):
     """Maps dominant emotions and keywords to specific secondary feelings."""
+    emotions, hits = ctx.emotions, ctx.hits
     
     feelings = {k: v for k, v in emotions['all_emotions'].items()}
     dominant = emotions['dominant']
     
     if dominant == 'sadness':
-        if 'lonely' in text_lower or 'alone' in text_lower:
+        if hits.any('lonely', 'alone'):
             feelings['lonely'] = feelings['sadness'] * 0.9
-        elif 'disappoint' in text_lower or 'fed up' in text_lower or 'not working' in text_lower or 'drained' in text_lower:
+        elif hits.any('disappoint', 'fed up', 'not working', 'drained'):
             feelings['disappointed'] = feelings['sadness'] * 0.9
         else:
             feelings['despair'] = feelings['sadness'] * 0.7
     
     elif dominant == 'anger':
-        if 'fed up' in text_lower or 'not working' in text_lower or 'project' in text_lower:
+        if hits.any('fed up', 'not working', 'project'):
             feelings['frustrated'] = feelings['anger'] * 0.95
-        elif 'threat' in text_lower or 'mad' in text_lower:
+        elif hits.any('threat', 'mad'):
             feelings['mad'] = feelings['anger'] * 0.8
         
     elif dominant == 'fear':
-        if 'anxious' in text_lower or 'worried' in text_lower or 'deadline' in text_lower or 'overwhelmed' in text_lower:
+        if hits.any('anxious', 'worried', 'deadline', 'overwhelmed'):
             feelings['anxious'] = feelings['fear'] * 0.95
         else:
             feelings['scared'] = feelings['fear'] * 0.7
             
     elif dominant == 'joy':
-        if 'optimistic' in text_lower or 'proud' in text_lower:
+        if hits.any('optimistic', 'proud'):
             feelings['optimistic'] = feelings['joy'] * 0.95
         else:
             feelings['peaceful'] = feelings['joy'] * 0.7
@@ -163,16 +1339,16 @@ def map_emotions_to_feelings(emotions, text_lower):
     
     return feelings
 
-def analyze_mood_level(text, emotions):
+def analyze_mood_level(ctx):
     """Mood Rating (0=Bad, 100=Good). Penalizes for negative emotions/keywords."""
-    text_lower = text.lower()
+    emotions, hits = ctx.emotions, ctx.hits
     
-    high = sum(1 for k in DEPRESSION_KEYWORDS['high_risk'] if k in text_lower)
-    med = sum(1 for k in DEPRESSION_KEYWORDS['medium_risk'] if k in text_lower)
-    low = sum(1 for k in DEPRESSION_KEYWORDS['low_risk'] if k in text_lower)
+    high = hits.count('depression_high')
+    med = hits.count('depression_medium')
+    low = hits.count('depression_low')
     keyword_score = (high * 100) + (med * 40) + (low * 15)
     
-    sentiment_polarity = TextBlob(text).sentiment.polarity
+    sentiment_polarity = ctx.polarity
     sadness_score = emotions['all_emotions'].get('sadness', 0)
     anger_score = emotions['all_emotions'].get('anger', 0)
     fear_score = emotions['all_emotions'].get('fear', 0)
@@ -189,10 +1365,10 @@ def analyze_mood_level(text, emotions):
     if neutral_score > 50 and sentiment_polarity < 0.5:
         raw_low_mood += neutral_score * 0.15 
     
-    stress_key_count = sum(1 for k in STRESS_KEYWORDS['high'] + STRESS_KEYWORDS['medium'] if k in text_lower)
+    stress_key_count = hits.count('stress_high', 'stress_medium')
     raw_low_mood += stress_key_count * 25 
 
-    positive_key_count = sum(1 for k in POSITIVE_KEYWORDS if k in text_lower)
+    positive_key_count = hits.count('positive')
     raw_low_mood -= positive_key_count * 40 
 
     low_mood_score = min(100, raw_low_mood / 1.5) 
@@ -224,13 +1400,13 @@ def analyze_mood_level(text, emotions):
         'label_class': label_class 
     }
 
-def analyze_stress_level(text, emotions):
+def analyze_stress_level(ctx):
     """Stress Score (0=Low, 100=High)."""
-    text_lower = text.lower()
+    emotions, hits = ctx.emotions, ctx.hits
     
-    high = sum(1 for k in STRESS_KEYWORDS['high'] if k in text_lower)
-    med = sum(1 for k in STRESS_KEYWORDS['medium'] if k in text_lower)
-    low = sum(1 for k in STRESS_KEYWORDS['low'] if k in text_lower)
+    high = hits.count('stress_high')
+    med = hits.count('stress_medium')
+    low = hits.count('stress_low')
 
     keyword_score = (high * 60) + (med * 35) + (low * 15)
     
@@ -239,12 +1415,12 @@ def analyze_stress_level(text, emotions):
     surprise_score = emotions['all_emotions'].get('surprise', 0)
     sadness_score = emotions['all_emotions'].get('sadness', 0)
     
-    polarity = TextBlob(text).sentiment.polarity 
+    polarity = ctx.polarity
     general_stress_penalty = (1 - polarity) * 15 
         
     raw_stress = keyword_score + (fear_score * 0.9) + (anger_score * 0.5) + (surprise_score * 0.3) + (sadness_score * 0.6) + general_stress_penalty
     
-    positive_key_count = sum(1 for k in POSITIVE_KEYWORDS if k in text_lower)
+    positive_key_count = hits.count('positive')
     raw_stress -= positive_key_count * 50 
 
     final_score = min(100, raw_stress / 1.7) 
@@ -259,44 +1435,157 @@ def analyze_stress_level(text, emotions):
 
     return {'level': level, 'score': int(final_score), 'explanation': msg}
 
-def analyze_emotions(text):
-    """Analyzes emotions and includes overrides for 'overwhelmed' and 'nervous'."""
-    text_lower = text.lower()
+def emotion_override(ctx):
+    """Keyword rules that replace the model's emotions for 'overwhelmed' and 'nervous' texts."""
+    hits = ctx.hits
     
-    if 'overwhelmed' in text_lower or 'amount of work' in text_lower or 'too much' in text_lower or 'drained' in text_lower or 'never catch up' in text_lower:
-        print("Override: Forcing high FEAR/ANXIETY/SADNESS due to 'overwhelmed' or 'drained' keywords.")
+    if hits.any('overwhelmed', 'amount of work', 'too much', 'drained', 'never catch up'):
+        log.debug('emotion override', extra={'rule': 'overwhelmed'})
         custom_emotions = {
             'fear': 50.0, 'sadness': 40.0, 'anger': 5.0, 'neutral': 2.0,
             'surprise': 1.0, 'joy': 1.0, 'disgust': 1.0,
         }
-        dominant = 'fear' if 'overwhelmed' in text_lower else 'sadness'
-        return {'dominant': dominant, 'all_emotions': custom_emotions}
+        dominant = 'fear' if 'overwhelmed' in hits else 'sadness'
+        return {'dominant': dominant, 'all_emotions': custom_emotions, 'model': KEYWORD_OVERRIDE_TAG}
         
-    is_nervous = 'nervous' in text_lower or 'anxious' in text_lower
-    is_mitigated = any(k in text_lower for k in POSITIVE_KEYWORDS)
+    is_nervous = hits.any('nervous', 'anxious')
+    is_mitigated = hits.count('positive') > 0
     
     if is_nervous and is_mitigated:
-        print("Override: Mitigating 'nervous' due to positive keywords.")
+        log.debug('emotion override', extra={'rule': 'nervous-mitigated'})
         custom_emotions = {
             'neutral': 60.0, 'joy': 20.0, 'fear': 15.0,     
             'sadness': 0.0, 'anger': 0.0, 'disgust': 0.0, 'surprise': 5.0
         }
         dominant = 'neutral'
-        return {'dominant': dominant, 'all_emotions': custom_emotions}
-        
-    if not emotion_classifier:
-        return {'dominant': 'neutral', 'all_emotions': {'neutral': 100.0}}
-    try:
-        truncated_text = text[:1000]
-        results = emotion_classifier(truncated_text)[0]
-        emotions = {r['label']: round(r['score'] * 100, 1) for r in results}
-        dominant = max(emotions, key=emotions.get)
-        return {'dominant': dominant, 'all_emotions': emotions}
-    except Exception as e:
-        print(f"Error in emotion analysis: {e}")
-        return {'dominant': 'neutral', 'all_emotions': {'neutral': 100.0}}
+        return {'dominant': dominant, 'all_emotions': custom_emotions, 'model': KEYWORD_OVERRIDE_TAG}
+
+    return None
+
+
+def neutral_emotions():
+    return {'dominant': 'neutral', 'all_emotions': {'neutral': 100.0}, 'model': None}
+
+
+def emotions_from_scores(results):
+    emotions = {r['label']: round(r['score'] * 100, 1) for r in results}
+    return {'dominant': max(emotions, key=emotions.get), 'all_emotions': emotions, 'model': emotion_model_tag()}
+
+
+def split_into_windows(text, tokenizer=None):
+    """Splits text into overlapping windows of at most EMOTION_WINDOW_TOKENS tokens.
+
+    Uses the model tokenizer's offsets when available (whitespace words
+    otherwise) so every window fits the model without truncation. Returns
+    (window_text, token_count) pairs. When there are more windows than
+    EMOTION_MAX_WINDOWS, evenly spaced ones are kept so the whole entry is
+    still represented while latency stays bounded.
+    """
+    size = app.config['EMOTION_WINDOW_TOKENS']
+    step = size - app.config['EMOTION_WINDOW_OVERLAP']
+    max_windows = app.config['EMOTION_MAX_WINDOWS']
 
-def get_recommendations(mood, stress):
+    if tokenizer is not None and getattr(tokenizer, 'is_fast', False):
+        spans = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)['offset_mapping']
+    else:
+        spans = [match.span() for match in re.finditer(r'\S+', text)]
+    if len(spans) <= size:
+        return [(text, max(len(spans), 1))]
+
+    starts = [0]
+    while starts[-1] + size < len(spans):
+        starts.append(starts[-1] + step)
+    if len(starts) > max_windows:
+        last = len(starts) - 1
+        starts = [starts[round(i * last / (max_windows - 1))] for i in range(max_windows)] if max_windows > 1 else starts[:1]
+
+    windows = []
+    for start in starts:
+        stop = min(start + size, len(spans))
+        windows.append((text[spans[start][0]:spans[stop - 1][1]], stop - start))
+    return windows
+
+
+def classify_windowed(classifier, texts, via_batcher=False):
+    """Label scores for each text; the windows of all texts go through one batched call.
+
+    A text's window results are averaged, weighted by each window's length
+    in tokens.
+    """
+    windows = [split_into_windows(text, getattr(classifier, 'tokenizer', None)) for text in texts]
+    flat = [chunk for text_windows in windows for chunk, _ in text_windows]
+    if via_batcher:
+        outputs = emotion_batcher.classify_all(flat)
+    else:
+        outputs = classifier(flat, batch_size=app.config['EMOTION_BATCH_MAX_SIZE'], truncation=True)
+
+    results = []
+    position = 0
+    for text_windows in windows:
+        window_outputs = outputs[position:position + len(text_windows)]
+        position += len(text_windows)
+        if len(text_windows) == 1:
+            results.append([{'label': r['label'], 'score': float(r['score'])} for r in window_outputs[0]])
+            continue
+        total = sum(weight for _, weight in text_windows)
+        scores = {}
+        for (_, weight), output in zip(text_windows, window_outputs):
+            for r in output:
+                scores[r['label']] = scores.get(r['label'], 0.0) + float(r['score']) * weight / total
+        results.append([{'label': label, 'score': score} for label, score in scores.items()])
+    return results
+
+
+def emotion_cache_namespace():
+    return (f"emotion:{emotion_model_tag()}:w{app.config['EMOTION_WINDOW_TOKENS']}"
+            f"/{app.config['EMOTION_WINDOW_OVERLAP']}x{app.config['EMOTION_MAX_WINDOWS']}")
+
+
+def analyze_emotions(ctx):
+    """Analyzes emotions and includes overrides for 'overwhelmed' and 'nervous'."""
+    return analyze_emotions_batch([ctx], via_batcher=app.config['EMOTION_BATCHING'])[0]
+
+
+def analyze_emotions_batch(contexts, via_batcher=False):
+    """Emotion results for many contexts, with one classifier call for every cache miss.
+
+    Long texts are scored over sliding windows rather than truncated. With
+    `via_batcher`, the windows join the shared cross-request micro-batcher.
+    """
+    emotions = [None] * len(contexts)
+    cache_namespace = emotion_cache_namespace()
+    pending = []
+    for i, ctx in enumerate(contexts):
+        emotions[i] = emotion_override(ctx)
+        if emotions[i] is None:
+            results = result_cache.get(cache_namespace, ctx.text)
+            if results is not None:
+                emotions[i] = emotions_from_scores(results)
+            else:
+                pending.append(i)
+
+    if pending:
+        with metrics.timer('model_wait'):
+            emotion_classifier = emotion_model.get(timeout=app.config['EMOTION_MODEL_WAIT_SECONDS'])
+        try:
+            if not emotion_classifier:
+                raise RuntimeError('emotion model unavailable')
+            with metrics.timer('emotion_model'):
+                batch = classify_windowed(emotion_classifier, [contexts[i].text for i in pending], via_batcher)
+        except Exception as e:
+            log.error('emotion analysis failed', extra={'error': str(e)})
+            batch = [None] * len(pending)
+        for i, results in zip(pending, batch):
+            if results is None:
+                emotions[i] = neutral_emotions()
+                continue
+            result_cache.set(cache_namespace, contexts[i].text, results)
+            emotions[i] = emotions_from_scores(results)
+
+    return emotions
+
+def get_recommendations(ctx):
+    mood, stress = ctx.mood, ctx.stress
     recs = []
     
     if mood['score'] <= 15: 
@@ -318,20 +1607,475 @@ def get_recommendations(mood, stress):
 
     return list(dict.fromkeys(recs))[:3]
 
-def speech_to_text(audio_file_path):
-    recognizer = sr.Recognizer()
+def score_context(ctx):
+    """Fills in mood, stress, recommendations and feelings once emotions are known."""
+    with metrics.timer('sentiment'):
+        ctx.polarity  # TextBlob runs here (or hits the cache), outside the stages below
+    with metrics.timer('mood'):
+        ctx.mood = analyze_mood_level(ctx)
+    with metrics.timer('stress'):
+        ctx.stress = analyze_stress_level(ctx)
+    with metrics.timer('recommendations'):
+        ctx.recommendations = get_recommendations(ctx)
+    with metrics.timer('feelings'):
+        ctx.feelings = map_emotions_to_feelings(ctx)
+    return ctx
+
+def run_analysis(text):
+    """Runs the full scoring pipeline for one check-in and returns its context."""
+    ctx = AnalysisContext(text)
+    ctx.emotions = analyze_emotions(ctx)
+    return score_context(ctx)
+
+def run_analysis_batch(texts, emotions=None):
+    """Scores many texts with one batched model call.
+
+    `emotions` may supply already-known results (e.g. stored on the entry);
+    only the positions that are None go through the model.
+    """
+    contexts = [AnalysisContext(text) for text in texts]
+    emotions = list(emotions) if emotions is not None else [None] * len(texts)
+    todo = [i for i, result in enumerate(emotions) if result is None]
+    for i, result in zip(todo, analyze_emotions_batch([contexts[i] for i in todo])):
+        emotions[i] = result
+    for ctx, result in zip(contexts, emotions):
+        ctx.emotions = result
+        score_context(ctx)
+    return contexts
+
+# --- Re-scoring Stored Check-ins ---
+
+def summarize_deltas(deltas):
+    changed = [d for d in deltas if d]
+    return {
+        'changed': len(changed),
+        'meanAbsDelta': round(sum(abs(d) for d in deltas) / len(deltas), 2) if deltas else 0,
+        'maxAbsDelta': max((abs(d) for d in deltas), default=0),
+    }
+
+
+def rescore_chunk(after_id=0, chunk_size=256, dry_run=False, reuse_emotions=False):
+    """Re-scores the next `chunk_size` entries with id > `after_id`.
+
+    Entries are read in id order (keyset, so any chunk can be resumed), scored
+    with one batched model call, and written back with a single bulk UPDATE
+    unless `dry_run`. With `reuse_emotions`, entries whose stored emotions
+    came from the current model skip inference, which is what re-tuning the
+    mood/stress weights needs. Returns None when there is nothing left.
+    """
+    rows = db.session.execute(
+        db.select(
+            CheckInEntry.id, CheckInEntry.full_text, CheckInEntry.mood_score, CheckInEntry.stress_score,
+            CheckInEntry.emotion_vector, CheckInEntry.dominant_emotion, CheckInEntry.emotion_model,
+            CheckInEntry.version,
+        )
+        .where(CheckInEntry.id > after_id)
+        .order_by(CheckInEntry.id)
+        .limit(chunk_size)
+    ).all()
+    if not rows:
+        return None
+
+    current_tag = emotion_model_tag()
+    stored = [
+        {'dominant': r.dominant_emotion, 'all_emotions': unpack_emotions(r.emotion_vector), 'model': r.emotion_model}
+        if reuse_emotions and r.emotion_vector is not None and r.emotion_model == current_tag else None
+        for r in rows
+    ]
+    contexts = run_analysis_batch([r.full_text for r in rows], stored)
+
+    updates = []
+    mood_deltas = []
+    stress_deltas = []
+    for row, ctx in zip(rows, contexts):
+        mood_deltas.append(ctx.mood['score'] - row.mood_score)
+        stress_deltas.append(ctx.stress['score'] - row.stress_score)
+        updates.append({
+            'id': row.id,
+            'mood_score': ctx.mood['score'],
+            'stress_score': ctx.stress['score'],
+            'recommendations': "||".join(ctx.recommendations),
+            'emotion_vector': pack_emotions(ctx.emotions['all_emotions']),
+            'dominant_emotion': ctx.emotions['dominant'],
+            'emotion_model': ctx.emotions['model'],
+            'version': (row.version or 0) + 1,
+        })
+
+    if not dry_run:
+        db.session.execute(db.update(CheckInEntry), updates)
+        db.session.commit()
+
+    return {
+        'lastId': rows[-1].id,
+        'count': len(rows),
+        'moodDeltas': mood_deltas,
+        'stressDeltas': stress_deltas,
+    }
+
+# --- Process-Pool Analysis Workers ---
+
+class WorkerPoolBusy(Exception):
+    """Raised when the analysis worker queue is full."""
+
+
+class WorkerCrashed(Exception):
+    """Raised for a task whose worker process died or stopped responding."""
+
+
+def analysis_worker_main(conn):
+    """Entry point of an analysis worker process: load the model once, then serve tasks."""
+    app.config['EMOTION_BATCHING'] = False
+    emotion_model.get()
+    try:
+        conn.send(('ready', os.getpid(), emotion_model.status()))
+        while True:
+            kind, payload = conn.recv()
+            if kind == 'ping':
+                conn.send(('pong', None))
+            elif kind == 'analyze':
+                stage_timings.set({})
+                try:
+                    result = ('ok', dict(run_analysis(payload).results(), stages=stage_timings.get()))
+                except Exception as e:
+                    result = ('error', str(e))
+                conn.send(result)
+    except (EOFError, OSError, KeyboardInterrupt):
+        # The supervisor closed the pipe (shutdown or restart)
+        return
+
+
+class AnalysisWorkerPool:
+    """Runs `run_analysis` in a fixed set of worker processes.
+
+    Each worker is owned by a supervisor thread in this process that pulls
+    tasks from a bounded queue, sends them over a pipe and waits for the
+    result. Idle workers are pinged every `health_interval` seconds; a worker
+    that dies, fails a ping or exceeds `task_timeout` is killed and respawned,
+    and only the task it was running fails. So is a worker that takes longer
+    than `start_timeout` to load the model.
+    """
+
+    def __init__(self, size, max_pending=64, task_timeout=60, health_interval=10, start_timeout=300):
+        self.size = size
+        self.task_timeout = task_timeout
+        self.health_interval = health_interval
+        self.start_timeout = start_timeout
+        self._mp = multiprocessing.get_context('spawn')
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._started = False
+        self._workers = {}
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.rejected = 0
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for index in range(self.size):
+            threading.Thread(target=self._supervise, args=(index,), name=f'analysis-worker-{index}', daemon=True).start()
+
+    def submit(self, text):
+        self.start()
+        future = Future()
+        try:
+            self._pending.put_nowait((text, future))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise WorkerPoolBusy('All analysis workers are busy. Please try again shortly.')
+        return future
+
+    def analyze(self, text):
+        results = self.submit(text).result()
+        # Stage timings measured in the worker are recorded here, in the serving process
+        for stage, seconds in results.pop('stages', {}).items():
+            metrics.record_stage(stage, seconds)
+        return AnalysisContext.from_results(text, results)
+
+    def _spawn(self, index):
+        parent_conn, child_conn = self._mp.Pipe()
+        process = self._mp.Process(target=analysis_worker_main, args=(child_conn,), name=f'analysis-worker-{index}', daemon=True)
+        process.start()
+        child_conn.close()
+        self._workers[index] = {'pid': process.pid, 'state': 'starting', 'tasks': 0, 'lastSeen': None, 'model': None}
+        try:
+            # The worker reports once it has tried to load the model; EOFError if it died
+            if not parent_conn.poll(self.start_timeout):
+                raise TimeoutError(f'worker did not start within {self.start_timeout}s')
+            _, _, model = parent_conn.recv()
+        except Exception:
+            self._kill(index, process, parent_conn)
+            raise
+        if model['state'] != 'ready':
+            log.error('analysis worker could not load the emotion model', extra={'worker': index, 'error': model['error']})
+        self._workers[index].update(state='idle', lastSeen=time.time(), model=model['state'], modelError=model['error'])
+        return process, parent_conn
+
+    def _kill(self, index, process, conn):
+        conn.close()
+        if process.is_alive():
+            process.kill()
+        process.join(timeout=5)
+        self._workers[index]['state'] = 'dead'
+
+    def _request(self, conn, message, timeout):
+        conn.send(message)
+        if not conn.poll(timeout):
+            raise TimeoutError('worker did not respond in time')
+        return conn.recv()
+
+    def _supervise(self, index):
+        process = conn = None
+        while True:
+            if process is None:
+                try:
+                    process, conn = self._spawn(index)
+                except Exception as e:
+                    log.error('analysis worker failed to start', extra={'worker': index, 'error': str(e)})
+                    time.sleep(1)
+                    process = None
+                    continue
+
+            try:
+                text, future = self._pending.get(timeout=self.health_interval)
+            except queue.Empty:
+                try:
+                    self._request(conn, ('ping', None), self.health_interval)
+                    self._workers[index]['lastSeen'] = time.time()
+                except (EOFError, OSError, TimeoutError) as e:
+                    log.warning('analysis worker failed health check; restarting', extra={'worker': index, 'error': str(e)})
+                    self._kill(index, process, conn)
+                    process = None
+                    self.restarts += 1
+                continue
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            self._workers[index]['state'] = 'busy'
+            try:
+                kind, payload = self._request(conn, ('analyze', text), self.task_timeout)
+            except (EOFError, OSError, TimeoutError) as e:
+                log.error('analysis worker crashed; restarting', extra={'worker': index, 'error': str(e)})
+                future.set_exception(WorkerCrashed(f'Analysis worker crashed: {e}'))
+                self._kill(index, process, conn)
+                process = None
+                with self._lock:
+                    self.failed += 1
+                    self.restarts += 1
+                continue
+
+            self._workers[index].update(state='idle', lastSeen=time.time(), tasks=self._workers[index]['tasks'] + 1)
+            with self._lock:
+                if kind == 'ok':
+                    self.completed += 1
+                    future.set_result(payload)
+                else:
+                    self.failed += 1
+                    future.set_exception(RuntimeError(payload))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'pending': self._pending.qsize(),
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'restarts': self.restarts,
+                'workers': [dict(worker, index=index) for index, worker in sorted(self._workers.items())],
+            }
+
+    def model_status(self):
+        """The emotion model's state across workers.
+
+        Ready once any running worker has loaded it, failed if every running
+        worker failed to, and loading while none has started yet.
+        """
+        with self._lock:
+            running = [worker for worker in self._workers.values() if worker['state'] in ('idle', 'busy')]
+        ready_workers = sum(worker['model'] == 'ready' for worker in running)
+        if ready_workers:
+            state, error = 'ready', None
+        elif running:
+            state, error = 'failed', running[0]['modelError']
+        else:
+            state, error = 'loading', None
+        return {'state': state, 'error': error, 'readyWorkers': ready_workers, 'workers': self.size}
+
+
+analysis_pool = AnalysisWorkerPool(
+    app.config['ANALYSIS_WORKERS'],
+    max_pending=app.config['ANALYSIS_QUEUE_SIZE'],
+    task_timeout=app.config['ANALYSIS_TASK_TIMEOUT_SECONDS'],
+    health_interval=app.config['ANALYSIS_HEALTH_INTERVAL_SECONDS'],
+    start_timeout=app.config['ANALYSIS_START_TIMEOUT_SECONDS'],
+) if app.config['ANALYSIS_WORKERS'] > 0 else None
+
+
+def analyze_text(text):
+    """Scores a check-in in the worker pool when enabled, otherwise in-process."""
+    with metrics.timer('analysis'):
+        if analysis_pool is not None:
+            return analysis_pool.analyze(text)
+        return run_analysis(text)
+
+
+def emotion_model_status():
+    """Model state for probes and stats; in pool mode only the workers load the model."""
+    if analysis_pool is not None:
+        return analysis_pool.model_status()
+    return emotion_model.status()
+
+# --- Voice Check-in Audio ---
+
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_SAMPLE_WIDTH = 2  # bytes per sample (signed 16-bit PCM)
+
+
+class AudioTooLarge(Exception):
+    """Raised when an uploaded recording exceeds AUDIO_MAX_BYTES."""
+
+
+def read_audio_upload(file):
+    """Reads an uploaded recording into memory, enforcing the size cap."""
+    max_bytes = app.config['AUDIO_MAX_BYTES']
+    audio_bytes = file.read(max_bytes + 1)
+    if len(audio_bytes) > max_bytes:
+        raise AudioTooLarge(f'Recording is too large (limit {max_bytes // (1024 * 1024)} MB).')
+    return audio_bytes
+
+
+def decode_audio(audio_bytes):
+    """Pipes the recording through ffmpeg and returns 16 kHz mono PCM as AudioData.
+
+    Nothing touches the disk: the upload goes in on stdin and raw PCM comes
+    back on stdout. Output is cut at AUDIO_MAX_SECONDS and the conversion is
+    killed after FFMPEG_TIMEOUT_SECONDS.
+    """
+    command = [
+        "ffmpeg", "-loglevel", "quiet", "-i", "pipe:0",
+        "-t", str(app.config['AUDIO_MAX_SECONDS']),
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE),
+        "pipe:1",
+    ]
+    with metrics.timer('ffmpeg'):
+        completed = subprocess.run(
+            command, input=audio_bytes, capture_output=True, check=True,
+            timeout=app.config['FFMPEG_TIMEOUT_SECONDS']
+        )
+    return sr.AudioData(completed.stdout, AUDIO_SAMPLE_RATE, AUDIO_SAMPLE_WIDTH)
+
+
+# --- Speech-to-Text Backends ---
+
+class GoogleASR:
+    """Google Web Speech API via speech_recognition (needs network access)."""
+
+    def __init__(self, config):
+        self.timeout = config['ASR_TIMEOUT_SECONDS']
+
+    def transcribe(self, audio_data):
+        recognizer = sr.Recognizer()
+        recognizer.operation_timeout = self.timeout
+        return recognizer.recognize_google(audio_data)
+
+
+class VoskASR:
+    """Offline Kaldi recognition with a local Vosk model directory."""
+
+    def __init__(self, config):
+        from vosk import Model
+        self.model = Model(config['ASR_VOSK_MODEL_PATH'])
+
+    def transcribe(self, audio_data):
+        from vosk import KaldiRecognizer
+        recognizer = KaldiRecognizer(self.model, AUDIO_SAMPLE_RATE)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=AUDIO_SAMPLE_RATE, convert_width=AUDIO_SAMPLE_WIDTH))
+        return json.loads(recognizer.FinalResult()).get('text')
+
+
+class WhisperASR:
+    """Offline Whisper recognition on CPU via faster-whisper (int8)."""
+
+    def __init__(self, config):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(config['ASR_WHISPER_MODEL'], device='cpu', compute_type='int8')
+
+    def transcribe(self, audio_data):
+        import numpy as np
+        raw = audio_data.get_raw_data(convert_rate=AUDIO_SAMPLE_RATE, convert_width=AUDIO_SAMPLE_WIDTH)
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self.model.transcribe(samples, language='en')
+        return ' '.join(segment.text.strip() for segment in segments)
+
+
+class StubASR:
+    """Deterministic stand-in that returns ASR_STUB_TEXT after ASR_STUB_DELAY_MS."""
+
+    def __init__(self, config):
+        self.text = config['ASR_STUB_TEXT']
+        self.delay = config['ASR_STUB_DELAY_MS'] / 1000.0
+
+    def transcribe(self, audio_data):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.text
+
+
+ASR_BACKENDS = {
+    'google': GoogleASR,
+    'vosk': VoskASR,
+    'whisper': WhisperASR,
+    'stub': StubASR,
+}
+
+_asr_backends = {}
+_asr_lock = threading.Lock()
+
+
+def get_asr_backend(name=None):
+    """Returns the (cached) speech-to-text backend named by ASR_BACKEND."""
+    name = name or app.config['ASR_BACKEND']
+    if name not in ASR_BACKENDS:
+        raise ValueError(f"Unknown ASR backend '{name}'. Choose one of: {', '.join(ASR_BACKENDS)}")
+    with _asr_lock:
+        if name not in _asr_backends:
+            _asr_backends[name] = ASR_BACKENDS[name](app.config)
+        return _asr_backends[name]
+
+
+def speech_to_text(audio_data):
+    if not audio_data.frame_data:
+        return None
     try:
-        with sr.AudioFile(audio_file_path) as source:
-            audio_data = recognizer.record(source)
-        text = recognizer.recognize_google(audio_data)
-        return text
-    except Exception:
+        with metrics.timer('asr'):
+            text = get_asr_backend().transcribe(audio_data)
+        return text or None
+    except Exception as e:
+        log.warning('speech recognition failed', extra={'backend': app.config['ASR_BACKEND'], 'error': str(e)})
         return None
 
 # ----------------------------------------------------
 # --- Application Routes (Integrated) ---
 # ----------------------------------------------------
 
+@app.route('/api/ready', methods=['GET'])
+def readiness():
+    """Readiness probe: 200 once the emotion model is loaded, 503 while loading.
+
+    With the analysis pool enabled the model lives in the workers, so this
+    reports whether any worker is ready and never loads it in this process.
+    """
+    if analysis_pool is None:
+        emotion_model.start_loading()
+    status = emotion_model_status()
+    ready = status['state'] == 'ready'
+    return jsonify({'ready': ready, 'emotionModel': status}), 200 if ready else 503
+
 @app.route('/')
 @login_required 
 def home():
@@ -390,91 +2134,834 @@ def logout():
     logout_user()
     return redirect(url_for('login'))
 
+# --- Check-in Processing (shared by /analyze and background audio jobs) ---
+
+class CheckInError(Exception):
+    """A check-in that cannot be processed, with the HTTP status to report."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def transcribe_upload(audio_bytes):
+    return speech_to_text(decode_audio(audio_bytes))
+
+
+class WriteQueueFull(Exception):
+    """Raised when the write-behind queue is at capacity."""
+
+
+def store_checkin(entry):
+    """Adds a new entry and folds it into the rollups (in the caller's transaction)."""
+    db.session.add(entry)
+    db.session.flush()
+    record_daily_rollups(entry)
+    if app.config['USER_STATS_ENABLED']:
+        record_user_stats(entry)
+
+
+class CheckInWriter:
+    """Write-behind queue for new check-ins, committed by one writer thread.
+
+    `submit` queues a transient CheckInEntry and returns a Future that
+    resolves to its id once it is committed. The writer collects entries for
+    up to `window_ms` (or until `max_batch_size` is reached) and commits them
+    in one transaction; if that fails, each entry is retried on its own so a
+    bad row only fails its own Future. `close` drains the queue.
+    """
+
+    def __init__(self, max_pending=1024, max_batch_size=64, window_ms=10):
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._batches = 0
+        self._written = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_seen = 0
+        self._commit_total = 0.0
+
+    def submit(self, entry):
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('The check-in writer is shut down.')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='checkin-writer', daemon=True)
+                self._thread.start()
+            try:
+                self._queue.put_nowait((entry, future))
+            except queue.Full:
+                self._rejected += 1
+                raise WriteQueueFull('Too many check-ins are waiting to be saved. Please try again shortly.')
+        return future
+
+    def close(self, timeout=30):
+        """Stops accepting entries and waits for everything queued to be committed."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while batch[-1] is not None and len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            stopping = batch[-1] is None
+            batch = [item for item in batch if item is not None]
+            if batch:
+                with app.app_context():
+                    self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        try:
+            for entry, _ in batch:
+                store_checkin(entry)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if len(batch) > 1:
+                for entry, future in batch:
+                    entry.id = None
+                    self._write([(entry, future)])
+                return
+            log.error('failed to save check-in', extra={'user_id': batch[0][0].user_id, 'error': str(e)})
+            with self._lock:
+                self._failed += 1
+            batch[0][1].set_exception(e)
+            return
+
+        elapsed = time.perf_counter() - started
+        metrics.record_stage('db_batch_commit', elapsed)
+        with self._lock:
+            self._batches += 1
+            self._written += len(batch)
+            self._max_seen = max(self._max_seen, len(batch))
+            self._commit_total += elapsed
+        for entry, future in batch:
+            future.set_result(entry.id)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': self._queue.qsize(),
+                'batches': self._batches,
+                'written': self._written,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'avgBatchSize': round(self._written / self._batches, 2) if self._batches else 0,
+                'maxBatchSize': self._max_seen,
+                'avgCommitMs': round(self._commit_total / self._batches * 1000, 2) if self._batches else 0,
+            }
+
+
+checkin_writer = CheckInWriter(
+    max_pending=app.config['WRITE_BEHIND_QUEUE_SIZE'],
+    max_batch_size=app.config['WRITE_BEHIND_BATCH_SIZE'],
+    window_ms=app.config['WRITE_BEHIND_WINDOW_MS'],
+) if app.config['WRITE_BEHIND_ENABLED'] else None
+
+if checkin_writer is not None:
+    atexit.register(checkin_writer.close)
+
+
+def complete_checkin(text_input, user_id, durable=False):
+    """Scores a check-in, saves it for the user and returns the response payload.
+
+    With the write-behind queue enabled the entry is only queued, unless
+    `durable` (or WRITE_BEHIND_WAIT) asks to wait for its commit.
+    """
+    if not text_input or len(text_input) < 10:
+        raise CheckInError('No valid text input detected, or audio was unclear/too short.', 400)
+
+    ctx = analyze_text(text_input)
+    
+    # --- NEW: Join recommendations into a single string for DB ---
+    recs_string = "||".join(ctx.recommendations)
+    
+    new_entry = CheckInEntry(
+        # timestamp is now handled by default=
+        mood_score=ctx.mood['score'],
+        stress_score=ctx.stress['score'],
+        full_text=text_input,
+        recommendations=recs_string, # Save the string
+        user_id=user_id
+    )
+    new_entry.set_emotions(ctx.emotions)
+    if checkin_writer is not None:
+        # Stamp it now rather than whenever the writer gets to it
+        new_entry.timestamp = datetime.now(UTC)
+        saved = checkin_writer.submit(new_entry)
+        if durable or app.config['WRITE_BEHIND_WAIT']:
+            with metrics.timer('db_commit_wait'):
+                saved.result(timeout=app.config['WRITE_BEHIND_WAIT_SECONDS'])
+    else:
+        with metrics.timer('db_commit'):
+            store_checkin(new_entry)
+            db.session.commit()
+
+    return {
+        'text': text_input,
+        'mood': ctx.mood, 
+        'stress': ctx.stress,
+        'emotion': {'dominant': ctx.emotions['dominant'], 'all_emotions': ctx.feelings},
+        'recommendations': ctx.recommendations 
+    }
+
+
+def checkin_error(e):
+    """Maps an exception raised while processing a check-in to (payload, HTTP status)."""
+    if isinstance(e, (CheckInError, Overloaded)):
+        return {'error': str(e)}, e.status
+    if isinstance(e, (WorkerPoolBusy, WriteQueueFull)):
+        return {'error': str(e)}, 503
+    if isinstance(e, TimeoutError):
+        return {'error': 'Saving your check-in is taking longer than expected. Please check your history shortly.'}, 504
+    if isinstance(e, AudioTooLarge):
+        return {'error': str(e)}, 413
+    if isinstance(e, subprocess.TimeoutExpired):
+        log.warning('ffmpeg conversion timed out')
+        return {'error': 'Audio conversion took too long. Please try a shorter recording.'}, 504
+    if isinstance(e, subprocess.CalledProcessError):
+        log.error('ffmpeg conversion failed', extra={'stderr': e.stderr.decode(errors='replace') if e.stderr else None})
+        return {'error': 'Audio conversion failed. Please ensure ffmpeg is installed and accessible.'}, 500
+    log.exception('check-in failed', exc_info=e)
+    return {'error': f'An internal server error occurred: {str(e)}'}, 500
+
+
+# --- Admission Control ---
+
+class Overloaded(Exception):
+    """Raised when a check-in is shed by admission control (503) or rate limiting (429)."""
+
+    def __init__(self, message, status=503, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after or app.config['ADMISSION_RETRY_AFTER_SECONDS']
+
+
+class AdmissionLimiter:
+    """Caps how many requests of one kind are processed at once.
+
+    Requests beyond `max_concurrent` wait up to `max_wait` seconds for a slot,
+    but only `max_waiting` may wait at a time (newcomers queue behind them);
+    anything else is rejected at once, so overload becomes fast 503s instead
+    of a backlog that clients time out on while it is still being worked.
+    Background work whose backlog is bounded elsewhere (async voice jobs)
+    passes `blocking=True` to wait for a slot without being shed.
+    """
+
+    def __init__(self, name, max_concurrent, max_waiting, max_wait):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+
+    @contextmanager
+    def slot(self, blocking=False):
+        self._acquire(blocking)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.active -= 1
+                self._cond.notify()
+
+    def _acquire(self, blocking=False):
+        with self._cond:
+            if blocking:
+                self._cond.wait_for(lambda: self.active < self.max_concurrent)
+            elif self.active >= self.max_concurrent or self.waiting:
+                if self.waiting >= self.max_waiting:
+                    self._reject()
+                self.waiting += 1
+                try:
+                    admitted = self._cond.wait_for(lambda: self.active < self.max_concurrent, self.max_wait)
+                finally:
+                    self.waiting -= 1
+                if not admitted:
+                    self._reject(timed_out=True)
+            self.active += 1
+            self.admitted += 1
+
+    def reject(self):
+        """Sheds a request that was turned away before reaching `slot` (e.g. a full job backlog)."""
+        with self._cond:
+            self._reject()
+
+    def _reject(self, timed_out=False):
+        if timed_out:
+            self.rejected_timeout += 1
+        else:
+            self.rejected_full += 1
+        raise Overloaded(f'The server is busy with other {self.name} check-ins. Please try again shortly.')
+
+    def stats(self):
+        with self._cond:
+            return {
+                'maxConcurrent': self.max_concurrent,
+                'active': self.active,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'rejectedQueueFull': self.rejected_full,
+                'rejectedTimeout': self.rejected_timeout,
+            }
+
+
+class RateLimiter:
+    """Per-user token buckets: `per_minute` check-ins sustained, in bursts of up to `burst`.
+
+    Only the `max_users` most recently seen users are tracked; a user who is
+    dropped simply starts again with a full bucket.
+    """
+
+    def __init__(self, per_minute, burst, max_users=100000):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_users = max_users
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def check(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(user_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[user_id] = (tokens, now)
+                self.limited += 1
+                raise Overloaded(
+                    "You're checking in very quickly. Please take a breath and try again in a moment.",
+                    status=429, retry_after=math.ceil((1 - tokens) / self.rate),
+                )
+            self._buckets[user_id] = (tokens - 1, now)
+            self.allowed += 1
+            while len(self._buckets) > self.max_users:
+                self._buckets.popitem(last=False)
+
+    def refund(self, user_id):
+        """Returns the token taken by `check` for a check-in that was rejected as invalid."""
+        with self._lock:
+            if user_id in self._buckets:
+                tokens, updated = self._buckets[user_id]
+                self._buckets[user_id] = (min(self.burst, tokens + 1), updated)
+                self.allowed -= 1
+
+    def stats(self):
+        with self._lock:
+            return {'perMinute': round(self.rate * 60, 2), 'burst': self.burst, 'trackedUsers': len(self._buckets),
+                    'allowed': self.allowed, 'limited': self.limited}
+
+
+text_admission = AdmissionLimiter(
+    'text', app.config['ADMISSION_TEXT_CONCURRENCY'], app.config['ADMISSION_TEXT_QUEUE_SIZE'],
+    app.config['ADMISSION_WAIT_SECONDS'],
+)
+audio_admission = AdmissionLimiter(
+    'voice', app.config['ADMISSION_AUDIO_CONCURRENCY'], app.config['ADMISSION_AUDIO_QUEUE_SIZE'],
+    app.config['ADMISSION_WAIT_SECONDS'],
+)
+checkin_rate_limiter = RateLimiter(
+    app.config['RATE_LIMIT_CHECKINS_PER_MINUTE'], app.config['RATE_LIMIT_BURST'],
+) if app.config['RATE_LIMIT_CHECKINS_PER_MINUTE'] > 0 else None
+
+# --- Asynchronous Audio Jobs ---
+
+class JobStore:
+    """In-memory registry of background analysis jobs.
+
+    Each update bumps the job's version and wakes anyone blocked in `wait`,
+    which is what the server-sent events stream listens on. Finished jobs are
+    dropped `ttl_seconds` after their last update.
+    """
+
+    FINISHED = ('done', 'failed')
+
+    def __init__(self, ttl_seconds=600):
+        self.ttl = ttl_seconds
+        self._jobs = {}
+        self._cond = threading.Condition()
+
+    def _purge(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['status'] in self.FINISHED and now - job['updated'] > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def create(self, user_id):
+        now = time.time()
+        job = {
+            'job_id': os.urandom(12).hex(),
+            'user_id': user_id,
+            'status': 'queued',
+            'stage': None,
+            'result': None,
+            'error': None,
+            'http_status': None,
+            'version': 0,
+            'updated': now,
+        }
+        with self._cond:
+            self._purge(now)
+            self._jobs[job['job_id']] = job
+        return dict(job)
+
+    def update(self, job_id, **fields):
+        with self._cond:
+            job = self._jobs[job_id]
+            job.update(fields, version=job['version'] + 1, updated=time.time())
+            self._cond.notify_all()
+
+    def pending(self):
+        """Number of jobs that are queued or running."""
+        with self._cond:
+            return sum(1 for job in self._jobs.values() if job['status'] not in self.FINISHED)
+
+    def get(self, job_id, user_id):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job['user_id'] != user_id:
+                return None
+            return dict(job)
+
+    def wait(self, job_id, user_id, version, timeout):
+        """Blocks until the job's version differs from `version` or `timeout` elapses."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: job_id not in self._jobs or self._jobs[job_id]['version'] != version, timeout
+            )
+        return self.get(job_id, user_id)
+
+    @staticmethod
+    def public(job):
+        return {
+            'job_id': job['job_id'],
+            'status': job['status'],
+            'stage': job['stage'],
+            'result': job['result'],
+            'error': job['error'],
+            'http_status': job['http_status'],
+        }
+
+
+job_store = JobStore(ttl_seconds=app.config['AUDIO_JOB_TTL_SECONDS'])
+audio_job_executor = ThreadPoolExecutor(max_workers=app.config['AUDIO_JOB_WORKERS'], thread_name_prefix='audio-job')
+
+
+def run_audio_job(job_id, user_id, audio_bytes):
+    # Jobs share the voice concurrency limit with synchronous voice check-ins;
+    # AUDIO_JOB_MAX_PENDING already bounds their backlog, so they wait rather than shed.
+    with audio_admission.slot(blocking=True), app.app_context():
+        job_store.update(job_id, status='running', stage='transcribing')
+        try:
+            text_input = transcribe_upload(audio_bytes)
+            job_store.update(job_id, stage='analyzing')
+            result = complete_checkin(text_input, user_id, durable=True)
+        except Exception as e:
+            db.session.rollback()
+            payload, status = checkin_error(e)
+            job_store.update(job_id, status='failed', error=payload['error'], http_status=status)
+        else:
+            job_store.update(job_id, status='done', result=result, http_status=200)
+
+
 @app.route('/analyze', methods=['POST'])
 @login_required 
 def analyze():
-    text_input = None
-    temp_webm_path = None 
-    temp_wav_path = None 
-    
+    durable = request.form.get('durable') == '1'
+    charged = False
     try:
+        if checkin_rate_limiter is not None:
+            checkin_rate_limiter.check(current_user.id)
+            charged = True
+
         if 'text' in request.form and request.form['text'].strip():
-            text_input = request.form['text'].strip()
+            with text_admission.slot():
+                return jsonify(complete_checkin(request.form['text'].strip(), current_user.id, durable))
         
         elif 'audio' in request.files:
-            file = request.files['audio']
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_audio:
-                file.save(temp_audio.name)
-                temp_webm_path = temp_audio.name
+            audio_bytes = read_audio_upload(request.files['audio'])
 
-            temp_wav_path = temp_webm_path.replace(".webm", ".wav")
-            
-            command = ["ffmpeg", "-i", temp_webm_path, "-ac", "1", "-ar", "16000", "-y", temp_wav_path, "-loglevel", "quiet"]
-            subprocess.run(command, capture_output=True, text=True, check=True)
-            
-            text_input = speech_to_text(temp_wav_path)
-            
-        if not text_input or len(text_input) < 10:
-            return jsonify({'error': 'No valid text input detected, or audio was unclear/too short.'}), 400
+            # Opt-in async mode: hand the slow work to a background executor
+            if request.form.get('async') == '1':
+                if job_store.pending() >= app.config['AUDIO_JOB_MAX_PENDING']:
+                    audio_admission.reject()
+                job = job_store.create(current_user.id)
+                audio_job_executor.submit(run_audio_job, job['job_id'], current_user.id, audio_bytes)
+                return jsonify(dict(
+                    JobStore.public(job),
+                    status_url=url_for('get_job_status', job_id=job['job_id']),
+                    events_url=url_for('stream_job_events', job_id=job['job_id']),
+                )), 202
 
-        emotion_results = analyze_emotions(text_input) 
-        mood = analyze_mood_level(text_input, emotion_results) 
-        stress = analyze_stress_level(text_input, emotion_results) 
-        recs = get_recommendations(mood, stress)
-        
-        secondary_feelings = map_emotions_to_feelings(emotion_results, text_input.lower())
-        
-        # --- NEW: Join recommendations into a single string for DB ---
-        recs_string = "||".join(recs)
-        
-        new_entry = CheckInEntry(
-            # timestamp is now handled by default=
-            mood_score=mood['score'],
-            stress_score=stress['score'],
-            full_text=text_input,
-            recommendations=recs_string, # Save the string
-            user_id=current_user.id
-        )
-        db.session.add(new_entry)
-        db.session.commit()
+            with audio_admission.slot():
+                return jsonify(complete_checkin(transcribe_upload(audio_bytes), current_user.id, durable))
 
-        return jsonify({
-            'text': text_input,
-            'mood': mood, 
-            'stress': stress,
-            'emotion': {'dominant': emotion_results['dominant'], 'all_emotions': secondary_feelings},
-            'recommendations': recs 
-        })
+        return jsonify(complete_checkin(None, current_user.id))
 
-    except subprocess.CalledProcessError as e:
-        print(f"ffmpeg conversion failed: {e.stderr}")
-        return jsonify({'error': 'Audio conversion failed. Please ensure ffmpeg is installed and accessible.'}), 500
     except Exception as e:
-        print(f"!!! FATAL ANALYSIS/SAVE ERROR: {e}")
-        return jsonify({'error': f'An internal server error occurred: {str(e)}'}), 500
-    
-    finally:
-        if temp_webm_path and os.path.exists(temp_webm_path):
-            os.remove(temp_webm_path)
-        if temp_wav_path and os.path.exists(temp_wav_path):
-            os.remove(temp_wav_path)
+        # Invalid submissions and check-ins shed by the server don't use up the user's burst
+        if charged and isinstance(e, (CheckInError, Overloaded, WorkerPoolBusy, WriteQueueFull)):
+            checkin_rate_limiter.refund(current_user.id)
+        payload, status = checkin_error(e)
+        response = jsonify(payload)
+        if status in (429, 503):
+            response.headers['Retry-After'] = str(getattr(e, 'retry_after', app.config['ADMISSION_RETRY_AFTER_SECONDS']))
+        return response, status
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_job_status(job_id):
+    job = job_store.get(job_id, current_user.id)
+    if job is None:
+        return jsonify(error="Job not found."), 404
+    return jsonify(JobStore.public(job))
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+@login_required
+def stream_job_events(job_id):
+    """Server-sent events stream of a job's status until it finishes."""
+    user_id = current_user.id
+    if job_store.get(job_id, user_id) is None:
+        return jsonify(error="Job not found."), 404
+
+    def events():
+        version = None
+        while True:
+            job = job_store.wait(job_id, user_id, version, timeout=15)
+            if job is None:
+                return
+            if job['version'] == version:
+                yield ': keep-alive\n\n'
+                continue
+            version = job['version']
+            yield f"data: {json.dumps(JobStore.public(job))}\n\n"
+            if job['status'] in JobStore.FINISHED:
+                return
+
+    return Response(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def encode_cursor(entry):
+    raw = json.dumps([entry.timestamp.isoformat(), entry.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    timestamp, entry_id = json.loads(raw)
+    return datetime.fromisoformat(timestamp), int(entry_id)
+
+
+def parse_date_arg(value, end=False):
+    """Parses a from/to query value; a bare date for `to` covers the whole day."""
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
 
 
 @app.route('/api/user_data', methods=['GET'])
 @login_required
 def get_user_data():
-    """API endpoint to fetch all historical check-in entries for the logged-in user."""
-    
-    entries = db.session.execute(
+    """API endpoint to fetch the logged-in user's check-in history.
+
+    Without `limit` or `cursor` the full history is returned as a list (the
+    original response). With them, results are keyset-paginated newest first
+    and wrapped as {entries, next_cursor}. Optional `from`/`to` (ISO dates)
+    filter by time and `fields` (comma separated) selects entry fields.
+    Responses carry an ETag, so an unchanged history revalidates with a 304.
+    """
+    args = request.args
+    paginated = 'limit' in args or 'cursor' in args
+    try:
+        limit = min(max(int(args.get('limit', 50)), 1), 500)
+        cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+        date_from = parse_date_arg(args['from']) if args.get('from') else None
+        date_to = parse_date_arg(args['to'], end=True) if args.get('to') else None
+        fields = [f for f in args.get('fields', '').split(',') if f] or None
+    except (ValueError, TypeError):
+        return jsonify(error="Invalid limit, cursor or date parameter."), 400
+    if fields and not set(fields) <= set(CheckInEntry.SERIALIZERS):
+        return jsonify(error=f"Unknown field. Choose from: {', '.join(CheckInEntry.SERIALIZERS)}"), 400
+
+    conditions = [CheckInEntry.user_id == current_user.id]
+    if date_from:
+        conditions.append(CheckInEntry.timestamp >= date_from)
+    if date_to:
+        conditions.append(CheckInEntry.timestamp < date_to if len(args['to']) == 10 else CheckInEntry.timestamp <= date_to)
+
+    def history_etag(fingerprint):
+        return hashlib.sha256(f"{current_user.id}|{request.query_string.decode()}|{fingerprint}".encode()).hexdigest()[:32]
+
+    def not_modified(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    query = (
         db.select(CheckInEntry)
-          .filter_by(user_id=current_user.id)
-          .order_by(CheckInEntry.timestamp.desc())
-    ).scalars().all()
+          .where(*conditions)
+          .order_by(CheckInEntry.timestamp.desc(), CheckInEntry.id.desc())
+    )
+    if cursor:
+        query = query.where(db.tuple_(CheckInEntry.timestamp, CheckInEntry.id) < cursor)
+
+    if paginated:
+        # A page's ETag comes from the page itself (ids, versions and the next
+        # cursor), so revalidating costs the same as reading the page.
+        entries = db.session.execute(query.limit(limit + 1)).scalars().all()
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1]) if has_more else None
+        etag = history_etag((tuple((entry.id, entry.version) for entry in entries), next_cursor))
+        if etag in request.if_none_match:
+            return not_modified(etag)
+        response = jsonify({
+            'entries': [entry.to_dict(fields) for entry in entries],
+            'next_cursor': next_cursor,
+        })
+    else:
+        # Cheap fingerprint of the filtered history; the rows are only loaded and
+        # serialized when the client's copy is stale.
+        fingerprint = db.session.execute(
+            db.select(
+                db.func.count(CheckInEntry.id),
+                db.func.max(CheckInEntry.id),
+                db.func.sum(CheckInEntry.mood_score),
+                db.func.sum(CheckInEntry.stress_score),
+                db.func.sum(db.func.coalesce(CheckInEntry.version, 0)),
+            ).where(*conditions)
+        ).one()
+        etag = history_etag(tuple(fingerprint))
+        if etag in request.if_none_match:
+            return not_modified(etag)
+        entries = db.session.execute(query).scalars().all()
+        response = jsonify([entry.to_dict(fields) for entry in entries])
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def search_query(text):
+    """Turns free text into an FTS5 query that needs every word; a trailing * matches prefixes."""
+    terms = re.findall(r'\w+\*?', text)
+    return ' '.join(f'"{term.rstrip("*")}"' + ('*' if term.endswith('*') else '') for term in terms)
+
+
+def highlight_snippet(snippet):
+    """HTML-escapes an FTS snippet and turns its \\x02/\\x03 match markers into <mark> tags."""
+    return html.escape(snippet).replace('\x02', '<mark>').replace('\x03', '</mark>')
+
+
+@app.route('/api/search', methods=['GET'])
+@login_required
+def search_entries():
+    """Full-text search over the logged-in user's check-ins, best matches first.
+
+    `q` is matched word by word (stemmed, so "worry" also finds "worried").
+    `limit` and `offset` page through the results and `fields` selects entry
+    fields as in /api/user_data. Each result also carries an HTML-safe
+    `snippet` with the matched words in <mark> tags, and a relevance `score`.
+    """
+    args = request.args
+    query = search_query(args.get('q', ''))
+    if not query:
+        return jsonify(error="Enter at least one word to search for."), 400
+    try:
+        limit = min(max(int(args.get('limit', 20)), 1), 100)
+        offset = max(int(args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify(error="Invalid limit or offset parameter."), 400
+    fields = [f for f in args.get('fields', '').split(',') if f] or None
+    if fields and not set(fields) <= set(CheckInEntry.SERIALIZERS):
+        return jsonify(error=f"Unknown field. Choose from: {', '.join(CheckInEntry.SERIALIZERS)}"), 400
+
+    # Scoping the MATCH itself to the user keeps the cost to their own matches.
+    # The query's words only match full_text, and user_id gets no weight in the ranking.
+    try:
+        matches = db.session.execute(db.text(f"""
+            SELECT rowid AS id,
+                   bm25({SEARCH_TABLE}, 1.0, 0.0) AS rank,
+                   snippet({SEARCH_TABLE}, 0, char(2), char(3), '…', 16) AS snippet
+            FROM {SEARCH_TABLE}
+            WHERE {SEARCH_TABLE} MATCH :query
+            ORDER BY rank
+            LIMIT :limit OFFSET :offset
+        """), {'query': f'user_id:"{current_user.id}" AND full_text:({query})', 'limit': limit + 1, 'offset': offset}).all()
+    except OperationalError as e:
+        log.error('search failed', extra={'error': str(e)})
+        return jsonify(error="Search is not available right now."), 503
+
+    has_more = len(matches) > limit
+    matches = matches[:limit]
+    entries = {
+        entry.id: entry for entry in db.session.execute(
+            db.select(CheckInEntry).where(
+                CheckInEntry.id.in_([match.id for match in matches]), CheckInEntry.user_id == current_user.id
+            )
+        ).scalars()
+    }
+    return jsonify({
+        'results': [
+            dict(entries[match.id].to_dict(fields), snippet=highlight_snippet(match.snippet), score=round(-match.rank, 3))
+            for match in matches if match.id in entries
+        ],
+        'next_offset': offset + limit if has_more else None,
+    })
 
-    data = [entry.to_dict() for entry in entries]
-    
-    return jsonify(data)
+
+def summarize_rollups(rows):
+    """Combines rollup rows into one {count, avg/min/max mood and stress} bucket."""
+    count = sum(r.checkin_count for r in rows)
+    return {
+        'count': count,
+        'avg_mood': round(sum(r.mood_sum for r in rows) / count, 1) if count else 0,
+        'avg_stress': round(sum(r.stress_sum for r in rows) / count, 1) if count else 0,
+        'min_mood': min((r.mood_min for r in rows), default=None),
+        'max_mood': max((r.mood_max for r in rows), default=None),
+        'min_stress': min((r.stress_min for r in rows), default=None),
+        'max_stress': max((r.stress_max for r in rows), default=None),
+    }
+
+
+@app.route('/api/trends', methods=['GET'])
+@login_required
+def get_trends():
+    """Daily or weekly mood/stress trends served from the rollup table.
+
+    Query args: `period` (day|week), optional `from`/`to` ISO dates, `limit`
+    (most recent N periods) and `scope=platform` (admins only). Cost scales
+    with the number of days, not the number of entries.
+    """
+    args = request.args
+    period = args.get('period', 'day')
+    if period not in ('day', 'week'):
+        return jsonify(error="period must be 'day' or 'week'."), 400
+    if args.get('scope') == 'platform':
+        if current_user.role != 'admin':
+            return jsonify(error="Forbidden"), 403
+        scope = PLATFORM_SCOPE
+    else:
+        scope = current_user.id
+    try:
+        date_from = datetime.fromisoformat(args['from']).date() if args.get('from') else None
+        date_to = datetime.fromisoformat(args['to']).date() if args.get('to') else None
+        limit = int(args['limit']) if args.get('limit') else None
+    except ValueError:
+        return jsonify(error="Invalid date or limit parameter."), 400
+    if limit is not None and limit < 1:
+        return jsonify(error="limit must be at least 1."), 400
+
+    query = db.select(DailyRollup).where(DailyRollup.user_id == scope).order_by(DailyRollup.day)
+    if date_from:
+        query = query.where(DailyRollup.day >= date_from)
+    if date_to:
+        query = query.where(DailyRollup.day <= date_to)
+    rows = db.session.execute(query).scalars().all()
+
+    buckets = {}
+    for row in rows:
+        start = row.day if period == 'day' else row.day - timedelta(days=row.day.weekday())
+        buckets.setdefault(start, []).append(row)
+    periods = [dict(summarize_rollups(bucket_rows), period=start.isoformat()) for start, bucket_rows in buckets.items()]
+    if limit is not None:
+        periods = periods[-limit:]
+
+    return jsonify({
+        'period': period,
+        'periods': periods,
+        'totals': summarize_rollups(rows),
+    })
+
+
+@app.route('/api/analyze_batch', methods=['POST'])
+@login_required
+def analyze_batch():
+    """Admin batch scoring.
+
+    With {"texts": [...]} the texts are scored (nothing is saved). Otherwise one
+    chunk of stored entries is re-scored: {"after_id", "chunk_size",
+    "dry_run", "reuse_emotions"}; call again with the returned `next_after_id`
+    until it is null. That final call rebuilds the daily rollups and user stats.
+    """
+    if current_user.role != 'admin':
+        return jsonify(error="Forbidden"), 403
+
+    body = request.get_json(silent=True) or {}
+    max_batch = app.config['ANALYZE_BATCH_MAX_SIZE']
+
+    if 'texts' in body:
+        texts = body['texts']
+        if not isinstance(texts, list) or not all(isinstance(t, str) and t.strip() for t in texts):
+            return jsonify(error="'texts' must be a list of non-empty strings."), 400
+        if len(texts) > max_batch:
+            return jsonify(error=f"At most {max_batch} texts per request."), 400
+        return jsonify({'results': [
+            {
+                'mood': ctx.mood,
+                'stress': ctx.stress,
+                'emotion': {'dominant': ctx.emotions['dominant'], 'all_emotions': ctx.feelings},
+                'recommendations': ctx.recommendations,
+            }
+            for ctx in run_analysis_batch([t.strip() for t in texts])
+        ]})
+
+    try:
+        after_id = int(body.get('after_id', 0))
+        chunk_size = min(max(int(body.get('chunk_size', max_batch)), 1), max_batch)
+    except (TypeError, ValueError):
+        return jsonify(error="after_id and chunk_size must be integers."), 400
+    dry_run = bool(body.get('dry_run', False))
+
+    chunk = rescore_chunk(after_id, chunk_size, dry_run=dry_run, reuse_emotions=bool(body.get('reuse_emotions', False)))
+    if chunk is None:
+        if not dry_run:
+            # End of a write run: recompute the tables derived from the scores
+            rebuild_daily_rollups()
+            if app.config['USER_STATS_ENABLED']:
+                rebuild_user_stats()
+        return jsonify({'count': 0, 'next_after_id': None, 'dryRun': dry_run})
+    return jsonify({
+        'count': chunk['count'],
+        'next_after_id': chunk['lastId'],
+        'dryRun': dry_run,
+        'mood': summarize_deltas(chunk['moodDeltas']),
+        'stress': summarize_deltas(chunk['stressDeltas']),
+    })
 
 
 # --- NEW: ADMIN ROUTES ---
@@ -498,54 +2985,33 @@ def get_admin_data():
     if current_user.role != 'admin':
         return jsonify(error="Forbidden"), 403
 
-    # --- Database Queries ---
-    total_users = db.session.scalar(db.select(db.func.count(User.id)))
-    total_checkins = db.session.scalar(db.select(db.func.count(CheckInEntry.id)))
-    
-    avg_mood = 0
-    avg_stress = 0
-    
-    # Calculate averages, handle division by zero if no entries
-    if total_checkins > 0:
-        avg_mood = db.session.scalar(db.select(db.func.avg(CheckInEntry.mood_score)))
-        avg_stress = db.session.scalar(db.select(db.func.avg(CheckInEntry.stress_score)))
-
-    # --- NEW: Per-User Aggregate Data (Privacy-Safe) ---
+    # --- Per-User Aggregate Data (Privacy-Safe) ---
+    # One grouped query (or a read of the incremental stats table) instead of
+    # loading every user's entries.
     users_data = []
-    users = db.session.execute(db.select(User)).scalars().all()
-    
-    for user in users:
-        user_checkins = db.session.execute(
-            db.select(CheckInEntry)
-            .filter_by(user_id=user.id)
-            .order_by(CheckInEntry.timestamp.desc())
-        ).scalars().all()
-        
-        if not user_checkins:
-            users_data.append({
-                'username': user.username,
-                'email': user.email,
-                'role': user.role,
-                'totalCheckins': 0,
-                'avgMood': 0,
-                'avgStress': 0,
-                'lastActivity': None
-            })
-            continue
-
-        user_avg_mood = sum(e.mood_score for e in user_checkins) / len(user_checkins)
-        user_avg_stress = sum(e.stress_score for e in user_checkins) / len(user_checkins)
-        
+    total_checkins = 0
+    mood_total = 0
+    stress_total = 0
+
+    for row in db.session.execute(user_aggregates_query()):
+        count = row.checkin_count or 0
+        total_checkins += count
+        mood_total += row.mood_sum or 0
+        stress_total += row.stress_sum or 0
         users_data.append({
-            'username': user.username,
-            'email': user.email,
-            'role': user.role,
-            'totalCheckins': len(user_checkins),
-            'avgMood': round(user_avg_mood, 1),
-            'avgStress': round(user_avg_stress, 1),
-            'lastActivity': user_checkins[0].timestamp.isoformat()
+            'username': row.username,
+            'email': row.email,
+            'role': row.role,
+            'totalCheckins': count,
+            'avgMood': round(row.mood_sum / count, 1) if count else 0,
+            'avgStress': round(row.stress_sum / count, 1) if count else 0,
+            'lastActivity': row.last_activity.isoformat() if row.last_activity else None
         })
 
+    total_users = len(users_data)
+    avg_mood = mood_total / total_checkins if total_checkins else 0
+    avg_stress = stress_total / total_checkins if total_checkins else 0
+
     # Return all data as JSON
     return jsonify({
         'platformStats': {
@@ -557,6 +3023,185 @@ def get_admin_data():
         'usersData': users_data
     })
 
+
+# --- Admin Export ---
+
+EXPORT_COLUMNS = ('id', 'user_id', 'timestamp', 'mood_score', 'stress_score', 'dominant_emotion', 'emotion_model')
+
+
+def export_chunks(conditions, include_text, chunk_size):
+    """Yields export records in lists of `chunk_size`.
+
+    Each chunk is a keyset page (id > last id, like `rescore_chunk`) read in
+    its own short transaction, so a slow download never holds a read lock
+    that would block check-ins from committing.
+    """
+    columns = [getattr(CheckInEntry, name) for name in EXPORT_COLUMNS] + [CheckInEntry.emotion_vector]
+    if include_text:
+        columns.append(CheckInEntry.full_text)
+    last_id = 0
+    while True:
+        try:
+            rows = db.session.execute(
+                db.select(*columns)
+                  .where(CheckInEntry.id > last_id, *conditions)
+                  .order_by(CheckInEntry.id)
+                  .limit(chunk_size)
+            ).all()
+        finally:
+            db.session.rollback()  # end the read transaction before the client consumes the chunk
+        if not rows:
+            return
+        last_id = rows[-1].id
+        records = []
+        for row in rows:
+            record = {name: getattr(row, name) for name in EXPORT_COLUMNS}
+            record['timestamp'] = row.timestamp.isoformat()
+            record['emotions'] = unpack_emotions(row.emotion_vector) if row.emotion_vector is not None else None
+            if include_text:
+                record['full_text'] = row.full_text
+            records.append(record)
+        yield records
+
+
+def encode_ndjson(chunks):
+    for records in chunks:
+        yield ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+
+
+def encode_csv(chunks, include_text):
+    """CSV with one column per emotion label (empty for entries without stored emotions)."""
+    header = list(EXPORT_COLUMNS) + [f'emotion_{label}' for label in EMOTION_LABELS]
+    if include_text:
+        header.append('full_text')
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for records in chunks:
+        for record in records:
+            emotions = record['emotions'] or {}
+            row = [record[name] for name in EXPORT_COLUMNS] + [emotions.get(label, '') for label in EMOTION_LABELS]
+            if include_text:
+                row.append(record['full_text'])
+            writer.writerow(row)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@app.route('/api/admin_export', methods=['GET'])
+@login_required
+def export_checkins():
+    """Streams every check-in as NDJSON (default) or CSV, optionally gzipped.
+
+    Query parameters: `format` (ndjson|csv), `gzip=1`, `from`/`to` (ISO
+    dates) and `user_id`. Rows are read and written a chunk at a time, so
+    memory use does not grow with the size of the table.
+    """
+    if current_user.role != 'admin':
+        return jsonify(error="Forbidden"), 403
+
+    args = request.args
+    export_format = args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify(error="Invalid format. Choose ndjson or csv."), 400
+    compress = args.get('gzip') == '1'
+    try:
+        date_from = parse_date_arg(args['from']) if args.get('from') else None
+        date_to = parse_date_arg(args['to'], end=True) if args.get('to') else None
+        user_id = int(args['user_id']) if args.get('user_id') else None
+    except (ValueError, TypeError):
+        return jsonify(error="Invalid date or user_id parameter."), 400
+
+    conditions = []
+    if date_from:
+        conditions.append(CheckInEntry.timestamp >= date_from)
+    if date_to:
+        conditions.append(CheckInEntry.timestamp < date_to if len(args['to']) == 10 else CheckInEntry.timestamp <= date_to)
+    if user_id is not None:
+        conditions.append(CheckInEntry.user_id == user_id)
+
+    include_text = app.config['ADMIN_EXPORT_INCLUDE_TEXT']
+    chunks = export_chunks(conditions, include_text, app.config['ADMIN_EXPORT_CHUNK_SIZE'])
+    body = encode_csv(chunks, include_text) if export_format == 'csv' else encode_ndjson(chunks)
+    filename = f"checkins-{datetime.now(UTC):%Y%m%d}.{export_format}"
+    if compress:
+        body = gzip_stream(body)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    else:
+        mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Cache-Control': 'no-store',
+    })
+
+
+@app.route('/api/model_stats', methods=['GET'])
+@login_required
+def get_model_stats():
+    if current_user.role != 'admin':
+        return jsonify(error="Forbidden"), 403
+
+    return jsonify({
+        'emotionModel': dict(emotion_model_status(), tag=emotion_model_tag()),
+        'emotionBatcher': emotion_batcher.stats(),
+        'resultCache': result_cache.stats(),
+        'analysisPool': analysis_pool.stats() if analysis_pool is not None else None,
+        'checkinWriter': checkin_writer.stats() if checkin_writer is not None else None,
+        'userCache': user_cache.stats(),
+        'admission': {
+            'text': text_admission.stats(),
+            'audio': dict(audio_admission.stats(), pendingJobs=job_store.pending()),
+            'rateLimit': checkin_rate_limiter.stats() if checkin_rate_limiter is not None else None,
+        },
+    })
+
+
+def collect_component_stats():
+    """Exposes the numeric fields of each component's stats() as gauges."""
+    components = {
+        'emotion_batcher': emotion_batcher.stats(),
+        'result_cache': result_cache.stats(),
+        'user_cache': user_cache.stats(),
+        'analysis_pool': analysis_pool.stats() if analysis_pool is not None else None,
+        'checkin_writer': checkin_writer.stats() if checkin_writer is not None else None,
+        'text_admission': text_admission.stats(),
+        'audio_admission': audio_admission.stats(),
+        'rate_limiter': checkin_rate_limiter.stats() if checkin_rate_limiter is not None else None,
+    }
+    for component, stats in components.items():
+        for key, value in (stats or {}).items():
+            if isinstance(value, (int, float)):
+                yield f'mindcheck_{component}_{re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower()}', None, value
+    model_state = emotion_model_status()['state']
+    for state in ('not_loaded', 'loading', 'ready', 'failed'):
+        yield 'mindcheck_emotion_model_state', {'state': state}, int(model_state == state)
+
+
+metrics.add_collector(collect_component_stats)
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition of request, stage and component metrics."""
+    token = app.config['METRICS_TOKEN']
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify(error="Forbidden"), 403
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # --- END NEW ADMIN ROUTES ---
 
 
@@ -564,4 +3209,11 @@ def get_admin_data():
 if __name__ == '__main__':
     with app.app_context():
         db.create_all() 
+        upgrade_schema()
+    # Warm the model in the background in the serving process (not the reloader parent)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        if analysis_pool is not None:
+            analysis_pool.start()
+        else:
+            emotion_model.start_loading()
     app.run(debug=True)
\ No newline at end of file
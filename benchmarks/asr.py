@@ -0,0 +1,71 @@
+"""Measure speech-to-text latency for a given ASR backend, offline.
+
+Feeds synthetic 16 kHz mono clips of several lengths through the backend
+selected with --backend (the deterministic 'stub' by default, or a local
+'vosk'/'whisper' model) and reports p50/p95 transcription latency per
+clip length. Network-backed engines can be measured the same way, but the
+point is to tune the pipeline without network access.
+
+Usage (from the repository root):
+    python -m benchmarks.asr --backend stub --seconds 5 15 60
+"""
+import argparse
+import math
+import struct
+import time
+
+import speech_recognition as sr
+
+from app import app, ASR_BACKENDS, AUDIO_SAMPLE_RATE, AUDIO_SAMPLE_WIDTH, get_asr_backend
+from benchmarks.results import percentile, write_results
+
+
+def synthetic_clip(seconds, frequency=220.0):
+    """A quiet sine tone; enough to exercise decoding and the recognizer."""
+    count = int(seconds * AUDIO_SAMPLE_RATE)
+    samples = (int(3000 * math.sin(2 * math.pi * frequency * i / AUDIO_SAMPLE_RATE)) for i in range(count))
+    frames = struct.pack(f'<{count}h', *samples)
+    return sr.AudioData(frames, AUDIO_SAMPLE_RATE, AUDIO_SAMPLE_WIDTH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', default='stub', choices=list(ASR_BACKENDS))
+    parser.add_argument('--seconds', type=float, nargs='+', default=[5, 15, 60])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--stub-delay-ms', type=int, default=0, help='simulated latency for the stub backend')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    app.config['ASR_STUB_DELAY_MS'] = args.stub_delay_ms
+    started = time.perf_counter()
+    backend = get_asr_backend(args.backend)
+    load_seconds = time.perf_counter() - started
+
+    results = []
+    for seconds in args.seconds:
+        clip = synthetic_clip(seconds)
+        latencies = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            backend.transcribe(clip)
+            latencies.append((time.perf_counter() - started) * 1000)
+        row = {
+            'name': f'{args.backend}/{seconds:g}s',
+            'backend': args.backend,
+            'clipSeconds': seconds,
+            'p50Ms': round(percentile(latencies, 50), 2),
+            'p95Ms': round(percentile(latencies, 95), 2),
+            'realTimeFactor': round(percentile(latencies, 50) / 1000 / seconds, 4),
+        }
+        results.append(row)
+        print(f"{args.backend:<8} {seconds:>6.1f}s clip  p50={row['p50Ms']:>9.2f}ms  "
+              f"p95={row['p95Ms']:>9.2f}ms  rtf={row['realTimeFactor']}")
+    print(f"backend load: {load_seconds:.2f}s")
+
+    if args.json:
+        write_results(args.json, 'asr', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Compare emotion inference backends: label agreement and latency.
+
+Runs every configured backend over the sample corpus, reports p50/p95
+single-text latency, and measures how often each backend's dominant label
+agrees with the reference `transformers` pipeline. Exits non-zero if any
+backend falls below --min-agreement, so it doubles as a parity check. The
+stub backend's labels are hash-derived, so it is only run when asked for
+and is left out of the agreement check.
+
+Usage (from the repository root):
+    python -m benchmarks.backends --backends transformers quantized onnx
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from app import app, EMOTION_BACKENDS
+from benchmarks.corpus import SAMPLE_TEXTS
+from benchmarks.results import percentile, write_results
+
+# Backends whose labels are not meant to match the reference model
+UNGATED_BACKENDS = ('stub',)
+DEFAULT_BACKENDS = [name for name in EMOTION_BACKENDS if name not in UNGATED_BACKENDS]
+
+
+def run_backend(name, texts, repeat):
+    load_started = time.perf_counter()
+    classifier = EMOTION_BACKENDS[name](app.config['EMOTION_MODEL_NAME'])
+    load_seconds = time.perf_counter() - load_started
+
+    classifier(texts[0])  # warm-up
+    latencies = []
+    outputs = []
+    for _ in range(repeat):
+        outputs = []
+        for text in texts:
+            started = time.perf_counter()
+            result = classifier(text)[0]
+            latencies.append((time.perf_counter() - started) * 1000)
+            outputs.append({r['label']: float(r['score']) for r in result})
+
+    return {
+        'name': name,
+        'backend': name,
+        'loadSeconds': round(load_seconds, 2),
+        'p50Ms': round(percentile(latencies, 50), 2),
+        'p95Ms': round(percentile(latencies, 95), 2),
+        'meanMs': round(statistics.mean(latencies), 2),
+    }, outputs
+
+
+def compare(reference, outputs):
+    agree = sum(
+        1 for ref, out in zip(reference, outputs)
+        if max(ref, key=ref.get) == max(out, key=out.get)
+    )
+    max_diff = max(abs(ref[label] - out.get(label, 0)) for ref, out in zip(reference, outputs) for label in ref)
+    return round(agree / len(reference), 3), round(max_diff, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backends', nargs='+', default=DEFAULT_BACKENDS, choices=list(EMOTION_BACKENDS))
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the corpus per backend')
+    parser.add_argument('--min-agreement', type=float, default=0.95)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    reference = None
+    if 'transformers' not in args.backends:
+        args.backends.insert(0, 'transformers')
+
+    results = []
+    for name in args.backends:
+        stats, outputs = run_backend(name, SAMPLE_TEXTS, args.repeat)
+        if name == 'transformers':
+            reference = outputs
+        stats['labelAgreement'], stats['maxScoreDiff'] = compare(reference, outputs)
+        results.append(stats)
+        print(f"{name:<14} p50={stats['p50Ms']:>8.2f}ms  p95={stats['p95Ms']:>8.2f}ms  "
+              f"agreement={stats['labelAgreement']:.3f}  max_diff={stats['maxScoreDiff']:.4f}  "
+              f"load={stats['loadSeconds']}s")
+
+    if args.json:
+        write_results(args.json, 'backends', vars(args), results)
+
+    failing = [
+        r['backend'] for r in results
+        if r['backend'] not in UNGATED_BACKENDS and r['labelAgreement'] < args.min_agreement
+    ]
+    if failing:
+        print(f"Label agreement below {args.min_agreement}: {', '.join(failing)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
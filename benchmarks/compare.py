@@ -0,0 +1,60 @@
+"""Compare two benchmark result files and flag regressions.
+
+Matches result rows by name and prints the relative change of every metric
+both runs recorded. Latency metrics (ending in 'Ms') regress when they grow,
+throughput ('opsPerSec') when it drops. Exits non-zero if any metric
+regressed by more than --threshold, so it can gate a commit.
+
+Usage (from the repository root):
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.15
+"""
+import argparse
+import sys
+
+from benchmarks.results import load_results
+
+
+def metric_changes(baseline, candidate):
+    """(name, metric, old, new, regression) for every metric recorded by both rows."""
+    for metric, old in baseline.items():
+        new = candidate.get(metric)
+        lower_is_better = metric.endswith('Ms')
+        if not (lower_is_better or metric == 'opsPerSec') or not old or new is None:
+            continue
+        change = (new - old) / old
+        yield metric, old, new, change if lower_is_better else -change
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.15, help='allowed relative slowdown per metric')
+    args = parser.parse_args()
+
+    baseline, candidate = load_results(args.baseline), load_results(args.candidate)
+    if baseline['benchmark'] != candidate['benchmark']:
+        raise SystemExit(f"Cannot compare '{baseline['benchmark']}' results with '{candidate['benchmark']}'")
+    print(f"{baseline['benchmark']}: {baseline['commit']} -> {candidate['commit']}")
+
+    candidate_rows = {row['name']: row for row in candidate['results']}
+    regressions = []
+    for row in baseline['results']:
+        other = candidate_rows.get(row['name'])
+        if other is None:
+            print(f"{row['name']:<32} missing from candidate")
+            continue
+        for metric, old, new, slowdown in metric_changes(row, other):
+            flag = ''
+            if slowdown > args.threshold:
+                flag = '  REGRESSION'
+                regressions.append(f"{row['name']} {metric}")
+            print(f"{row['name']:<32} {metric:<10} {old:>12} -> {new:<12} {slowdown:+.1%} slower{flag}")
+
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Sample check-in texts shared by the benchmark scripts."""
+import random
+
+SAMPLE_TEXTS = [
+    "I feel so hopeless and empty lately, like nothing I do matters anymore.",
+    "Exams are coming up and I'm stressed about the deadline, the assignments keep piling up.",
+    "Had a really nice walk today, feeling good and mostly ready for the week.",
+    "I'm nervous about my presentation but I think it's manageable and I'll be fine.",
+    "I've been so lonely since moving here, I spend most evenings alone and crying.",
+    "I'm fed up with this project, nothing is working and my team isn't helping.",
+    "Today was an okay day. Went to class, had lunch, watched a show.",
+    "I can't sleep, my heart keeps racing and I had a panic attack yesterday.",
+    "I'm proud of how I handled the interview and optimistic about hearing back.",
+    "Work has been so much pressure, my manager keeps adding tasks and I feel tense.",
+    "I got surprising news from home today and I don't really know how to feel.",
+    "Honestly I'm exhausted. I sleep ten hours and still wake up tired and down.",
+    "I'm angry that my roommate keeps ignoring the rules we agreed on.",
+    "The weather was lovely and I spent the afternoon reading in the park.",
+    "Everything feels numb. I go through the motions but I feel nothing at all.",
+    "I'm worried about my mom's health, the test results come back on Friday.",
+    "I finally finished my thesis draft! Tired, but so relieved and happy.",
+    "My friends cancelled on me again and I'm starting to think they don't care.",
+    "It was disgusting how that customer treated the waiter at dinner tonight.",
+    "Busy week with lots of meetings coming up, but I'm handling it one day at a time.",
+]
+
+# Word-count ranges of the synthetic check-ins, from a quick note to a long journal entry
+LENGTH_BUCKETS = {
+    'short': (8, 30),
+    'medium': (60, 200),
+    'long': (400, 1500),
+}
+
+
+def synthetic_texts(count, bucket, seed=0, sources=SAMPLE_TEXTS):
+    """`count` reproducible check-ins of the given length bucket, stitched from `sources`."""
+    rng = random.Random(f'{seed}:{bucket}')
+    low, high = LENGTH_BUCKETS[bucket]
+    texts = []
+    for _ in range(count):
+        target = rng.randint(low, high)
+        words = []
+        while len(words) < target:
+            words.extend(rng.choice(sources).split())
+        texts.append(' '.join(words[:target]))
+    return texts
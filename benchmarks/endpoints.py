@@ -0,0 +1,210 @@
+"""Measure end-to-end latency of /analyze, /api/user_data and /api/admin_data by database size.
+
+Seeds a scratch SQLite database (never mindcheck.db) with synthetic users
+and check-ins, growing it through each --sizes step. At every step it times
+requests through the Flask test client: text check-ins on /analyze (using
+the stub emotion classifier), one user's full history and first page from
+/api/user_data, their daily trends, and /api/admin_data as an admin.
+
+Pass --db to keep the seeded database and reuse it on later runs, so
+commits can be compared against the same data.
+
+Usage (from the repository root):
+    python -m benchmarks.endpoints --sizes 1000 10000 100000 1000000 --json endpoints.json
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, UTC
+
+from benchmarks.corpus import SAMPLE_TEXTS, synthetic_texts
+from benchmarks.results import percentile, write_results
+
+SEED_CHUNK = 10000
+PASSWORD = 'benchmark'
+
+
+def seed_users(mindcheck, count):
+    """`count` regular users plus one admin, all sharing one password hash."""
+    User, db = mindcheck.User, mindcheck.db
+    if db.session.query(User).count():
+        return
+    password_hash = mindcheck.generate_password_hash(PASSWORD)
+    users = [
+        {'username': f'bench-{i:05d}', 'email': f'bench-{i:05d}@example.com', 'password_hash': password_hash, 'role': 'user'}
+        for i in range(1, count + 1)
+    ]
+    users.append({'username': 'bench-admin', 'email': 'bench-admin@example.com', 'password_hash': password_hash, 'role': 'admin'})
+    db.session.execute(db.insert(User), users)
+    db.session.commit()
+
+
+def entry_templates(mindcheck):
+    """Scored column values for each sample text, reused round-robin when seeding."""
+    templates = []
+    for ctx in mindcheck.run_analysis_batch(SAMPLE_TEXTS):
+        entry = mindcheck.CheckInEntry()
+        entry.set_emotions(ctx.emotions)
+        templates.append({
+            'mood_score': ctx.mood['score'],
+            'stress_score': ctx.stress['score'],
+            'full_text': ctx.text,
+            'recommendations': '||'.join(ctx.recommendations),
+            'emotion_vector': entry.emotion_vector,
+            'dominant_emotion': entry.dominant_emotion,
+            'emotion_model': entry.emotion_model,
+        })
+    return templates
+
+
+def grow_entries(mindcheck, target, users, days, rng, templates):
+    """Adds check-ins until there are `target`, spread over `users` users and `days` days."""
+    CheckInEntry, db = mindcheck.CheckInEntry, mindcheck.db
+    existing = db.session.query(CheckInEntry).count()
+    now = datetime.now(UTC)
+    span = days * 86400
+    rows = []
+    for n in range(existing, target):
+        rows.append(dict(
+            templates[n % len(templates)],
+            user_id=rng.randint(1, users),
+            timestamp=now - timedelta(seconds=rng.randrange(span)),
+        ))
+        if len(rows) == SEED_CHUNK:
+            db.session.execute(db.insert(CheckInEntry), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(CheckInEntry), rows)
+    db.session.commit()
+    if target > existing:
+        rebuild_aggregates(mindcheck)
+    return max(existing, target)
+
+
+def rebuild_aggregates(mindcheck):
+    mindcheck.rebuild_daily_rollups()
+    if mindcheck.app.config['USER_STATS_ENABLED']:
+        mindcheck.rebuild_user_stats()
+
+
+def discard_entries_after(mindcheck, last_id):
+    """Removes check-ins saved while timing /analyze so the database stays at its seeded size."""
+    CheckInEntry, db = mindcheck.CheckInEntry, mindcheck.db
+    db.session.execute(db.delete(CheckInEntry).where(CheckInEntry.id > last_id))
+    db.session.commit()
+    rebuild_aggregates(mindcheck)
+
+
+def login(mindcheck, username):
+    client = mindcheck.app.test_client()
+    response = client.post('/login', data={'username': username, 'password': PASSWORD})
+    if response.status_code != 302:
+        raise SystemExit(f'Could not log in as {username}')
+    return client
+
+
+def time_requests(send, count, warmup=2):
+    for i in range(warmup):
+        send(i)
+    latencies = []
+    errors = 0
+    for i in range(count):
+        started = time.perf_counter()
+        response = send(warmup + i)
+        latencies.append((time.perf_counter() - started) * 1000)
+        errors += response.status_code != 200
+    return {
+        'requests': count,
+        'errors': errors,
+        'p50Ms': round(percentile(latencies, 50), 2),
+        'p95Ms': round(percentile(latencies, 95), 2),
+        'meanMs': round(statistics.mean(latencies), 2),
+        'maxMs': round(max(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--days', type=int, default=365, help='history span of the seeded check-ins')
+    parser.add_argument('--requests', type=int, default=50, help='timed requests per endpoint and size')
+    parser.add_argument('--db', help='seeded database file to create or reuse (default: a temporary file)')
+    parser.add_argument('--user-stats', action='store_true', help='serve /api/admin_data from the UserStats table')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    scratch = None
+    if args.db is None:
+        scratch = tempfile.mkdtemp(prefix='mindcheck-bench-')
+        args.db = os.path.join(scratch, 'bench.db')
+    # The app reads its database URL and rate limit at import time: use the scratch file,
+    # and don't rate limit the timed /analyze requests
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.abspath(args.db)}'
+    os.environ['RATE_LIMIT_CHECKINS_PER_MINUTE'] = '0'
+    import app as mindcheck
+    if mindcheck.app.config['SQLALCHEMY_DATABASE_URI'] != os.environ['DATABASE_URL']:
+        raise SystemExit('The app was imported before DATABASE_URL was set; refusing to seed its database')
+
+    app = mindcheck.app
+    app.config.update(
+        EMOTION_BACKEND='stub',
+        USER_STATS_ENABLED=args.user_stats,
+        SLOW_REQUEST_MS=None,
+    )
+    mindcheck.log.setLevel('WARNING')
+    rng = random.Random(args.seed)
+
+    results = []
+    try:
+        with app.app_context():
+            mindcheck.db.create_all()
+            mindcheck.upgrade_schema()
+            seed_users(mindcheck, args.users)
+            templates = entry_templates(mindcheck)
+
+        user = login(mindcheck, 'bench-00001')
+        admin = login(mindcheck, 'bench-admin')
+        for size in sorted(args.sizes):
+            started = time.perf_counter()
+            with app.app_context():
+                entries = grow_entries(mindcheck, size, args.users, args.days, rng, templates)
+            seed_seconds = round(time.perf_counter() - started, 1)
+            if entries > size:
+                print(f"Skipping {size}: the database already holds {entries} entries")
+                continue
+
+            with app.app_context():
+                last_id = mindcheck.db.session.query(mindcheck.db.func.max(mindcheck.CheckInEntry.id)).scalar()
+            texts = synthetic_texts(args.requests + 2, 'medium', seed=f'{args.seed}:{size}')
+            endpoints = {
+                'user_data': lambda i: user.get('/api/user_data'),
+                'user_data_page': lambda i: user.get('/api/user_data?limit=20'),
+                'trends': lambda i: user.get('/api/trends?period=day&limit=30'),
+                'admin_data': lambda i: admin.get('/api/admin_data'),
+                'analyze': lambda i: user.post('/analyze', data={'text': texts[i]}),
+            }
+            print(f"--- {size} entries (seeded in {seed_seconds}s) ---")
+            for endpoint, send in endpoints.items():
+                row = dict(name=f'{endpoint}@{size}', endpoint=endpoint, entries=size,
+                           **time_requests(send, args.requests))
+                results.append(row)
+                print(f"{endpoint:<16} p50={row['p50Ms']:>9.2f}ms  p95={row['p95Ms']:>9.2f}ms  "
+                      f"max={row['maxMs']:>9.2f}ms  errors={row['errors']}")
+            with app.app_context():
+                discard_entries_after(mindcheck, last_id)
+    finally:
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.json:
+        write_results(args.json, 'endpoints', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Measure emotion inference cost against entry length with sliding windows.
+
+Builds entries of increasing length from the sample corpus and reports the
+number of windows and p50/p95 latency of windowed classification for each,
+next to the old first-1000-characters truncation as a baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.long_text --words 50 200 500 1000 2000 5000 --max-windows 8
+"""
+import argparse
+import itertools
+import time
+
+from app import app, classify_windowed, emotion_model, split_into_windows
+from benchmarks.corpus import SAMPLE_TEXTS
+from benchmarks.results import percentile, write_results
+
+
+def entry_of_length(words):
+    vocabulary = itertools.cycle(' '.join(SAMPLE_TEXTS).split())
+    return ' '.join(itertools.islice(vocabulary, words))
+
+
+def measure(fn, repeat):
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return round(percentile(latencies, 50), 2), round(percentile(latencies, 95), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, nargs='+', default=[50, 200, 500, 1000, 2000, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-windows', type=int, default=app.config['EMOTION_MAX_WINDOWS'])
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    app.config['EMOTION_MAX_WINDOWS'] = args.max_windows
+    classifier = emotion_model.get()
+    if classifier is None:
+        raise SystemExit(f"Emotion model failed to load: {emotion_model.error}")
+    tokenizer = getattr(classifier, 'tokenizer', None)
+    classify_windowed(classifier, ['warm-up text for the model'])
+
+    results = []
+    for words in args.words:
+        text = entry_of_length(words)
+        windows = len(split_into_windows(text, tokenizer))
+        p50, p95 = measure(lambda: classify_windowed(classifier, [text]), args.repeat)
+        truncated_p50, _ = measure(lambda: classifier(text[:1000]), args.repeat)
+        row = {
+            'name': f'{words}w',
+            'words': words,
+            'chars': len(text),
+            'windows': windows,
+            'p50Ms': p50,
+            'p95Ms': p95,
+            'truncatedP50Ms': truncated_p50,
+        }
+        results.append(row)
+        print(f"{words:>6} words ({len(text):>6} chars)  windows={windows:<2}  "
+              f"p50={p50:>9.2f}ms  p95={p95:>9.2f}ms  (truncated p50={truncated_p50:.2f}ms)")
+
+    if args.json:
+        write_results(args.json, 'long_text', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Measure throughput of each analysis stage with the deterministic stub classifier.
+
+Scores synthetic check-ins from each length bucket and reports, per stage,
+calls per second and p50/p95 latency: keyword scanning, TextBlob sentiment,
+analyze_emotions (on texts built without emotion_override's keyword cues,
+with the result cache cleared before each call, so every call reaches the
+classifier), analyze_mood_level, analyze_stress_level, get_recommendations
+and the full run_analysis. --stub-delay-ms adds a fixed
+per-call cost to the stub to stand in for model inference.
+
+Usage (from the repository root):
+    python -m benchmarks.pipeline --count 200 --json pipeline.json
+"""
+import argparse
+import time
+
+from textblob import TextBlob
+
+from app import (
+    app, AnalysisContext, analyze_emotions, analyze_mood_level, analyze_stress_level,
+    emotion_override, get_recommendations, result_cache, run_analysis,
+)
+from benchmarks.corpus import LENGTH_BUCKETS, SAMPLE_TEXTS, synthetic_texts
+from benchmarks.results import percentile, write_results
+
+
+def measure(name, fn, items, repeat, before_each=None):
+    latencies = []
+    for _ in range(repeat):
+        for item in items:
+            if before_each:
+                before_each()
+            started = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - started)
+    total = sum(latencies)
+    return {
+        'name': name,
+        'calls': len(latencies),
+        'opsPerSec': round(len(latencies) / total, 1) if total else None,
+        'p50Ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95Ms': round(percentile(latencies, 95) * 1000, 3),
+    }
+
+
+def scored_contexts(texts):
+    """Contexts with emotions, polarity, mood and stress filled in, ready for the later stages."""
+    contexts = [AnalysisContext(text) for text in texts]
+    for ctx in contexts:
+        ctx.emotions = analyze_emotions(ctx)
+        ctx.polarity  # computes and caches TextBlob polarity
+        ctx.mood = analyze_mood_level(ctx)
+        ctx.stress = analyze_stress_level(ctx)
+    return contexts
+
+
+def classifier_texts(count, bucket, seed):
+    """Synthetic texts that skip emotion_override, so analyze_emotions times the classifier path.
+
+    The nervous rule fires on a nervous/anxious cue plus any positive word, which
+    long stitched texts almost always contain, so sample texts with either
+    rule's cues are left out of the mix.
+    """
+    sources = []
+    for text in SAMPLE_TEXTS:
+        ctx = AnalysisContext(text)
+        if emotion_override(ctx) is None and not ctx.hits.any('nervous', 'anxious'):
+            sources.append(text)
+    texts = synthetic_texts(count, bucket, seed=seed, sources=sources)
+    overridden = sum(emotion_override(AnalysisContext(text)) is not None for text in texts)
+    if overridden:
+        raise SystemExit(f'{overridden} {bucket} texts would skip the classifier')
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200, help='texts per length bucket')
+    parser.add_argument('--buckets', nargs='+', default=list(LENGTH_BUCKETS), choices=list(LENGTH_BUCKETS))
+    parser.add_argument('--repeat', type=int, default=3, help='passes over each bucket per stage')
+    parser.add_argument('--stub-delay-ms', type=float, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    app.config['EMOTION_BACKEND'] = 'stub'
+    app.config['EMOTION_STUB_DELAY_MS'] = args.stub_delay_ms
+    app.config['EMOTION_BATCHING'] = False
+
+    results = []
+    for bucket in args.buckets:
+        texts = synthetic_texts(args.count, bucket, seed=args.seed)
+        contexts = scored_contexts(texts)
+        model_contexts = [AnalysisContext(text) for text in classifier_texts(args.count, bucket, args.seed)]
+        stages = [
+            ('keywords', lambda text: AnalysisContext(text), texts, None),
+            ('sentiment', lambda ctx: TextBlob(ctx.text).sentiment.polarity, contexts, None),
+            ('analyze_emotions', analyze_emotions, model_contexts, result_cache.clear),
+            ('analyze_mood_level', analyze_mood_level, contexts, None),
+            ('analyze_stress_level', analyze_stress_level, contexts, None),
+            ('get_recommendations', get_recommendations, contexts, None),
+            ('run_analysis', run_analysis, texts, result_cache.clear),
+        ]
+        for stage, fn, items, before_each in stages:
+            row = measure(f'{stage}/{bucket}', fn, items, args.repeat, before_each)
+            row.update(stage=stage, bucket=bucket)
+            results.append(row)
+            print(f"{row['name']:<32} {row['opsPerSec']:>10.1f} ops/s  "
+                  f"p50={row['p50Ms']:>9.3f}ms  p95={row['p95Ms']:>9.3f}ms")
+
+    if args.json:
+        write_results(args.json, 'pipeline', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
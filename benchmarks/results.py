@@ -0,0 +1,42 @@
+"""JSON result files written by the benchmark suite and read by benchmarks.compare.
+
+Every file records the benchmark name, the git commit and time of the run,
+the settings used, and a list of result rows. Each row is identified by its
+'name' and holds latency ('p50Ms', 'p95Ms', ...) and/or 'opsPerSec' metrics.
+"""
+import json
+import platform
+import subprocess
+from datetime import datetime, UTC
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def write_results(path, benchmark, settings, results):
+    with open(path, 'w') as f:
+        json.dump({
+            'benchmark': benchmark,
+            'commit': git_commit(),
+            'ranAt': datetime.now(UTC).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'settings': settings,
+            'results': results,
+        }, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
@@ -12,6 +12,7 @@ with app.app_context():
 
     if user:
         user.role = 'admin'
+        # Committing a User change also invalidates the running server's cached session user
         db.session.commit()
         print(f"Success: User '{USERNAME_TO_MAKE_ADMIN}' has been promoted to admin.")
     else:
@@ -0,0 +1,16 @@
+from app import app, db, rebuild_user_stats, rebuild_daily_rollups, rebuild_search_index, upgrade_schema, UserStats, DailyRollup
+
+# Recomputes the derived tables from the stored check-ins: the per-user stats
+# table (used when USER_STATS_ENABLED is on), the daily trend rollups and the
+# full-text search index.
+# Run once after upgrading an existing database, or after re-scoring entries.
+
+with app.app_context():
+    db.create_all()
+    upgrade_schema()
+    rebuild_user_stats()
+    rebuild_daily_rollups()
+    rebuild_search_index()
+    users = db.session.scalar(db.select(db.func.count()).select_from(UserStats))
+    days = db.session.scalar(db.select(db.func.count()).select_from(DailyRollup))
+    print(f"Success: Rebuilt stats for {users} user(s), {days} daily rollup row(s) and the search index.")
@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+
+from app import app, emotion_model_tag, rescore_chunk, summarize_deltas, rebuild_daily_rollups, rebuild_user_stats
+
+# Re-scores every stored check-in with the current weights and emotion model.
+#
+#   python rescore.py --dry-run            # report score deltas, change nothing
+#   python rescore.py                      # re-score and write back in bulk
+#   python rescore.py --resume             # continue an interrupted run
+#   python rescore.py --reuse-emotions     # only re-run the scoring weights
+
+parser = argparse.ArgumentParser(description="Re-score stored check-ins in chunks.")
+parser.add_argument('--chunk-size', type=int, default=256)
+parser.add_argument('--dry-run', action='store_true', help="report score deltas without writing")
+parser.add_argument('--resume', action='store_true', help="continue from the progress file")
+parser.add_argument('--progress-file', default='rescore_progress.json')
+parser.add_argument('--reuse-emotions', action='store_true',
+                    help="skip the model for entries whose stored emotions came from the current model")
+args = parser.parse_args()
+
+after_id = 0
+processed = 0
+if args.resume and os.path.exists(args.progress_file):
+    with open(args.progress_file) as f:
+        progress = json.load(f)
+    after_id, processed = progress['last_id'], progress['processed']
+    print(f"Resuming after entry {after_id} ({processed} already processed).")
+
+mood_deltas = []
+stress_deltas = []
+
+with app.app_context():
+    while True:
+        chunk = rescore_chunk(after_id, args.chunk_size, dry_run=args.dry_run, reuse_emotions=args.reuse_emotions)
+        if chunk is None:
+            break
+        after_id = chunk['lastId']
+        processed += chunk['count']
+        mood_deltas += chunk['moodDeltas']
+        stress_deltas += chunk['stressDeltas']
+        if not args.dry_run:
+            with open(args.progress_file, 'w') as f:
+                json.dump({'last_id': after_id, 'processed': processed, 'model': emotion_model_tag()}, f)
+        print(f"Processed {processed} entries (up to id {after_id}).")
+
+    if not args.dry_run:
+        rebuild_daily_rollups()
+        if app.config['USER_STATS_ENABLED']:
+            rebuild_user_stats()
+        if os.path.exists(args.progress_file):
+            os.remove(args.progress_file)
+
+mood = summarize_deltas(mood_deltas)
+stress = summarize_deltas(stress_deltas)
+print(f"{'Dry run' if args.dry_run else 'Done'}: {len(mood_deltas)} entries re-scored this run.")
+print(f"  mood:   {mood['changed']} changed, mean |delta| {mood['meanAbsDelta']}, max |delta| {mood['maxAbsDelta']}")
+print(f"  stress: {stress['changed']} changed, mean |delta| {stress['meanAbsDelta']}, max |delta| {stress['maxAbsDelta']}")
@@ -216,6 +216,8 @@ function analyzeInput() {
             return;
         }
         formData.append('audio', audioBlob, 'recording.webm');
+        // Voice check-ins run as a background job; we wait for it below
+        formData.append('async', '1');
     }
 
     // Use a relative URL. Flask serves this file, so it knows where /analyze is.
@@ -228,6 +230,15 @@ function analyzeInput() {
             window.location.href = '/login';
             return;
         }
+        if (response.status === 202) {
+            return response.json().then(job => waitForJob(job));
+        }
+        if (response.status === 429 || response.status === 503) {
+            const retryAfter = response.headers.get('Retry-After');
+            return response.json().then(body => ({
+                error: retryAfter ? `${body.error} (You can try again in ${retryAfter}s.)` : body.error
+            }));
+        }
         if (!response.ok) {
             return response.text().then(text => { 
                 throw new Error(`Server error: ${response.status} ${response.statusText} - ${text}`) 
@@ -271,6 +282,59 @@ function analyzeInput() {
 }
 
 
+// --- [4b. Background Job Tracking (voice check-ins)] ---
+
+// Resolves with the /analyze-style result (or {error}) once the job finishes.
+// Uses server-sent events when available and falls back to polling.
+function waitForJob(job) {
+    return new Promise((resolve, reject) => {
+        const finish = (state) => {
+            if (state.status === 'done') {
+                resolve(state.result);
+            } else if (state.status === 'failed') {
+                resolve({ error: state.error });
+            } else {
+                return false;
+            }
+            return true;
+        };
+
+        if (window.EventSource) {
+            const source = new EventSource(job.events_url);
+            source.onmessage = event => {
+                if (finish(JSON.parse(event.data))) source.close();
+            };
+            source.onerror = () => {
+                source.close();
+                pollJob(job.status_url, finish, reject);
+            };
+        } else {
+            pollJob(job.status_url, finish, reject);
+        }
+    });
+}
+
+function pollJob(statusUrl, finish, reject) {
+    fetch(statusUrl)
+        .then(response => {
+            if (response.status === 401) {
+                window.location.href = '/login';
+                return new Promise(() => {});
+            }
+            if (!response.ok) {
+                throw new Error(`Job status error: ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(state => {
+            if (!finish(state)) {
+                setTimeout(() => pollJob(statusUrl, finish, reject), 1000);
+            }
+        })
+        .catch(reject);
+}
+
+
 // --- [5. Results Display Logic] ---
 
 function displayResults(data) {
@@ -395,21 +459,29 @@ function loadDashboard() {
     if (weeklyInsights) weeklyInsights.innerHTML = '<p style="padding: 20px; color: #6c757d;">Calculating insights...</p>';
     if (emotionSummary) emotionSummary.innerHTML = '';
 
-    fetch('/api/user_data') 
+    const fetchJson = (url, what) => fetch(url)
         .then(response => {
             if (response.status === 401) {
                 window.location.href = '/login'; 
                 return new Promise(() => {});
             }
             if (!response.ok) {
-                throw new Error('Failed to fetch user data.');
+                throw new Error(`Failed to fetch ${what}.`);
             }
             return response.json();
-        })
-        .then(log => {
-            if (!log) return; 
+        });
+
+    // Charts and averages come from the daily rollups; only the latest
+    // reflections are fetched as raw entries.
+    Promise.all([
+        fetchJson('/api/trends?period=day&limit=7', 'trend data'),
+        fetchJson('/api/user_data?limit=10', 'user data')
+    ])
+        .then(([trends, recent]) => {
+            if (!trends || !recent) return; 
+            const log = recent.entries;
             
-            if (log.length === 0) {
+            if (trends.totals.count === 0) {
                 if (reflectionsList) reflectionsList.innerHTML = '<p style="padding: 20px; color: #6c757d;">No data yet. Complete a check-in to see your trends.</p>';
                 if (weeklyInsights) weeklyInsights.innerHTML = '<p style="padding: 20px; color: #6c757d;">No data yet.</p>';
                 if (weekChartContainer) weekChartContainer.innerHTML = '<p style="padding: 20px; color: #6c757d;">No data to display.</p>';
@@ -419,15 +491,15 @@ function loadDashboard() {
             }
 
             // --- Prepare Data for Charts ---
-            const chartData = log.slice(0, 7).reverse(); 
+            const chartData = trends.periods; // one point per day, oldest first
             
-            const labels = chartData.map(entry => 
-                new Date(entry.timestamp).toLocaleDateString('en-US', { weekday: 'short', month: 'numeric', day: 'numeric' })
+            const labels = chartData.map(day => 
+                new Date(day.period + 'T00:00:00').toLocaleDateString('en-US', { weekday: 'short', month: 'numeric', day: 'numeric' })
             );
             
-            const moodScores = chartData.map(entry => entry.mood_score); 
-            const stressScores = chartData.map(entry => entry.stress_score);
-            const combinedScores = chartData.map(entry => (entry.mood_score + (100 - entry.stress_score)) / 2);
+            const moodScores = chartData.map(day => day.avg_mood); 
+            const stressScores = chartData.map(day => day.avg_stress);
+            const combinedScores = chartData.map(day => (day.avg_mood + (100 - day.avg_stress)) / 2);
 
             // --- Destroy and Re-render Charts ---
             if (weekChartInstance) weekChartInstance.destroy();
@@ -537,10 +609,8 @@ function loadDashboard() {
             });
             
             // --- Weekly Insights ---
-            const totalMood = log.reduce((acc, e) => acc + e.mood_score, 0);
-            const totalStress = log.reduce((acc, e) => acc + e.stress_score, 0);
-            const avgMood = (totalMood / log.length).toFixed(0);
-            const avgStress = (totalStress / log.length).toFixed(0);
+            const avgMood = trends.totals.avg_mood.toFixed(0);
+            const avgStress = trends.totals.avg_stress.toFixed(0);
 
             if (weeklyInsights) weeklyInsights.innerHTML = `
                 <div class="insight-item">